@@ -0,0 +1,152 @@
+from __future__ import annotations
+from datetime import datetime, timedelta
+from typing import Callable
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import timeit
+
+from lib.drawer import RubiksCubeDrawer
+from lib.result import Result, load_results, save_result, save_results
+from lib.rubiks_cube import Move, RubiksCube
+from lib.scrambler import RubiksCubeScrambler
+from lib.solver import M2Solver, Target
+
+
+def _random_moves(n: int) -> list[Move]:
+    rng = random.Random(n)
+    moves = list(Move)
+    return [rng.choice(moves) for _ in range(n)]
+
+
+_OUTER_TURNS = [m for m in Move if m.is_outer_turn()]
+_TARGETS = list(Target)
+
+
+def _random_result(rng: random.Random) -> Result:
+    return Result(
+        datetime(2024, 1, 1) + timedelta(seconds=rng.randrange(10**8)),
+        [rng.choice(_OUTER_TURNS) for _ in range(20)],
+        timedelta(milliseconds=rng.randrange(300_000)),
+        [rng.choice(_TARGETS) for _ in range(12)],
+        [rng.choice(_TARGETS) for _ in range(8)],
+        rng.random() < 0.5,
+        "EC_DELAY"
+    )
+
+
+def _write_results_file(filename: str, n: int) -> None:
+    rng = random.Random(n)
+    batch_size = 10_000
+    for start in range(0, n, batch_size):
+        save_results([_random_result(rng) for _ in range(min(batch_size, n - start))], filename)
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> tuple[float, int]:
+    """
+    Best time per call (in seconds) and the number of calls per measurement.
+    """
+    timer = timeit.Timer(fn)
+    (number, _) = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return (best / number, number)
+
+
+def _benchmarks(tmp_dir: str, quick: bool, name_filter: str) -> dict[str, tuple[Callable[[], object], int]]:
+    """
+    Benchmarks by name, along with the number of measurements to take.
+    """
+    random.seed(0)
+    scramble = RubiksCubeScrambler.random_scramble()
+    scramble_str = " ".join([str(m) for m in scramble])
+    solution = _random_moves(300)
+    scrambled = RubiksCube().apply(scramble)
+    rotated = scrambled.apply(Move.parse("X Y"))
+    edge_targets = [Target[t] for t in "ABCDEFHIJKLM"]
+    corner_targets = [Target[t] for t in "BCDEFGHI"]
+    result = _random_result(random.Random(0))
+    results_filename = os.path.join(tmp_dir, "save.csv")
+
+    benchmarks: dict[str, tuple[Callable[[], object], int]] = {
+        "rubiks_cube.apply.single_move": (lambda: RubiksCube().apply([Move.R]), 5),
+        "rubiks_cube.apply.scramble_20": (lambda: RubiksCube().apply(scramble), 5),
+        "rubiks_cube.apply.solution_300": (lambda: RubiksCube().apply(solution), 5),
+        "rubiks_cube.is_solved": (lambda: scrambled.is_solved(), 5),
+        "rubiks_cube.orient": (lambda: rotated.orient(), 5),
+        "move.parse": (lambda: Move.parse(scramble_str), 5),
+        "solver.apply_solution": (lambda: M2Solver.apply_solution(scrambled, edge_targets, corner_targets), 5),
+        "drawer.draw": (lambda: RubiksCubeDrawer.draw(scrambled), 5),
+        "result.save_result": (lambda: save_result(result, results_filename), 5),
+    }
+    for n in [10_000] if quick else [10_000, 1_000_000]:
+        if name_filter not in f"result.load_results.{n}":
+            continue
+        filename = os.path.join(tmp_dir, f"load_{n}.csv")
+        _write_results_file(filename, n)
+        benchmarks[f"result.load_results.{n}"] = ((lambda f=filename: load_results(f)), 3 if n <= 10_000 else 1)
+    return {name: b for (name, b) in benchmarks.items() if name_filter in name}
+
+
+def _compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """
+    Prints a comparison with the baseline and returns the benchmarks that regressed by more than the threshold.
+    """
+    regressions: list[str] = []
+    print(f"{'benchmark':40} {'seconds':>12} {'baseline':>12} {'ratio':>8}")
+    for (name, seconds) in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:40} {seconds:12.3e} {'-':>12} {'-':>8}")
+            continue
+        ratio = seconds / base
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = " REGRESSION"
+        print(f"{name:40} {seconds:12.3e} {base:12.3e} {ratio:8.2f}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the cube engine, solver and result I/O.")
+    parser.add_argument("-o", "--output", help="JSON file to write the results to")
+    parser.add_argument("-b", "--baseline", help="JSON file with results to compare against")
+    parser.add_argument(
+        "-t", "--threshold", type=float, default=0.1,
+        help="slowdown relative to the baseline (as a fraction) above which a benchmark counts as a regression"
+    )
+    parser.add_argument("--check", action="store_true", help="exit with an error if any benchmark regressed")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--quick", action="store_true", help="skip the largest inputs")
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for (name, (fn, repeat)) in _benchmarks(tmp_dir, args.quick, args.filter).items():
+            (seconds, _) = _measure(fn, repeat)
+            results[name] = seconds
+            print(f"{name:40} {seconds:12.3e} s", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "benchmarks": results
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["benchmarks"]
+        regressions = _compare(results, baseline, args.threshold)
+        if args.check and regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from concurrent.futures import as_completed, ProcessPoolExecutor
+import argparse
+import os
+import random
+import sys
+import time
+
+from lib.differential import ENGINES, run, shrink
+from lib.rubiks_cube import Move
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check that every cube engine gives the same result as RubiksCube.apply on random move sequences."
+    )
+    parser.add_argument("-n", "--cases", type=int, default=1_000_000, help="number of random move sequences")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="seed for the random move sequences")
+    parser.add_argument("-e", "--engine", action="append", choices=sorted(ENGINES), help="engine to check (default: all)")
+    parser.add_argument("--batch-size", type=int, default=5_000, help="number of sequences per task")
+    parser.add_argument("--max-length", type=int, default=30, help="maximum number of moves per sequence")
+    args = parser.parse_args()
+
+    seed = random.randrange(2**32) if args.seed is None else args.seed
+    engine_names = args.engine or sorted(ENGINES)
+    print(f"Checking {', '.join(engine_names)} on {args.cases} sequences with seed {seed}")
+
+    start = time.time()
+    # First failing sequence and number of failures of each engine
+    failures: dict[str, tuple[str, int]] = {}
+    done = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        batches = [
+            (seed + i, min(args.batch_size, args.cases - i * args.batch_size))
+            for i in range((args.cases + args.batch_size - 1) // args.batch_size)
+        ]
+        futures = {
+            executor.submit(run, batch_seed, n, engine_names, 1, args.max_length): n
+            for (batch_seed, n) in batches
+        }
+        for future in as_completed(futures):
+            for (name, (moves, count)) in future.result().items():
+                (first, total) = failures.get(name, (moves, 0))
+                failures[name] = (first, total + count)
+            done += futures[future]
+            n_failures = sum(count for (_, count) in failures.values())
+            print(f"\r{done}/{args.cases} sequences, {n_failures} failures", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    print(f"Finished in {time.time() - start:.1f} s")
+
+    # Only shrink the first failure of each engine
+    for (name, (moves, count)) in sorted(failures.items()):
+        minimal = shrink(Move.parse(moves), name)
+        print(f"{name}: {count} failures, e.g. {' '.join([str(m) for m in minimal])} (shrunk from {moves})")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
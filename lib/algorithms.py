@@ -0,0 +1,158 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator
+import csv
+import os
+
+from lib.permutation import move_definitions, Permutation
+from lib.rubiks_cube import Direction, Move
+from lib.simplifier import simplify
+from lib.table_cache import TableCache
+
+
+_INVERSE_DIRECTION = {Direction.CW: Direction.CCW, Direction.CCW: Direction.CW, Direction.DOUBLE: Direction.DOUBLE}
+_INVERSE_MOVES = {
+    m: next(n for n in Move if n.value == [(layer, _INVERSE_DIRECTION[d]) for (layer, d) in m.value])
+    for m in Move
+}
+
+
+def invert_move(m: Move) -> Move:
+    return _INVERSE_MOVES[m]
+
+
+@lru_cache(maxsize=4096)
+def _invert(moves: tuple[Move, ...]) -> tuple[Move, ...]:
+    return tuple(invert_move(m) for m in reversed(moves))
+
+
+def invert(moves: list[Move]) -> list[Move]:
+    return list(_invert(tuple(moves)))
+
+
+def compose(*algs: list[Move]) -> list[Move]:
+    return simplify([m for a in algs for m in a])
+
+
+@lru_cache(maxsize=4096)
+def _conjugate(setup: tuple[Move, ...], alg: tuple[Move, ...]) -> tuple[Move, ...]:
+    return tuple(compose(list(setup), list(alg), list(_invert(setup))))
+
+
+def conjugate(setup: list[Move], alg: list[Move]) -> list[Move]:
+    """
+    Conjugate [setup: alg], i.e., setup + alg + setup^-1.
+    """
+    return list(_conjugate(tuple(setup), tuple(alg)))
+
+
+@lru_cache(maxsize=None)
+def _permutations_key() -> str:
+    """
+    Key of the move definitions that saved permutations were computed with (see AlgorithmLibrary.save).
+    """
+    return TableCache.key(move_definitions()).hex()
+
+
+def commutator(a: list[Move], b: list[Move]) -> list[Move]:
+    """
+    Commutator [a, b], i.e., a + b + a^-1 + b^-1.
+    """
+    return compose(a, b, invert(a), invert(b))
+
+
+@dataclass(frozen=True)
+class Algorithm:
+    moves: tuple[Move, ...]
+    permutation: Permutation
+
+    @staticmethod
+    def of(moves: list[Move]) -> Algorithm:
+        moves = simplify(moves)
+        return Algorithm(tuple(moves), Permutation.of_moves(moves))
+
+    def inverse(self: Algorithm) -> Algorithm:
+        return Algorithm(_invert(self.moves), self.permutation.inverse())
+
+    def __len__(self: Algorithm) -> int:
+        return len(self.moves)
+
+    def __str__(self: Algorithm) -> str:
+        return " ".join([str(m) for m in self.moves])
+
+
+class AlgorithmLibrary:
+    """
+    Collection of algorithms indexed by the permutation they perform. Algorithms performing the same permutation are
+    only stored once (the shortest one is kept).
+    """
+
+    def __init__(self: AlgorithmLibrary) -> None:
+        self._by_permutation: dict[Permutation, Algorithm] = {}
+
+    def add(self: AlgorithmLibrary, moves: list[Move]) -> Algorithm:
+        """
+        Adds the algorithm to the library and returns the algorithm that is stored for its permutation.
+        """
+        return self._add(Algorithm.of(moves))
+
+    def _add(self: AlgorithmLibrary, alg: Algorithm) -> Algorithm:
+        existing = self._by_permutation.get(alg.permutation)
+        if existing is None or len(alg) < len(existing):
+            self._by_permutation[alg.permutation] = alg
+            return alg
+        return existing
+
+    def find(self: AlgorithmLibrary, permutation: Permutation) -> Algorithm | None:
+        """
+        Stored algorithm performing the given permutation, if any.
+        """
+        return self._by_permutation.get(permutation)
+
+    def solving(self: AlgorithmLibrary, permutation: Permutation) -> Algorithm | None:
+        """
+        Stored algorithm undoing the given permutation (e.g., a 3-cycle of stickers), if any.
+        """
+        return self._by_permutation.get(permutation.inverse())
+
+    def __contains__(self: AlgorithmLibrary, moves: object) -> bool:
+        return isinstance(moves, list) and Permutation.of_moves(moves) in self._by_permutation
+
+    def __len__(self: AlgorithmLibrary) -> int:
+        return len(self._by_permutation)
+
+    def __iter__(self: AlgorithmLibrary) -> Iterator[Algorithm]:
+        return iter(self._by_permutation.values())
+
+    def save(self: AlgorithmLibrary, filename: str) -> None:
+        """
+        Saves the algorithms along with their permutations so that loading the library does not require replaying them.
+        The header holds the key of the move definitions, so that the permutations are only reused with the same moves.
+        """
+        if os.path.dirname(filename):
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["algorithm", "permutation", _permutations_key()])
+            for alg in self:
+                writer.writerow([str(alg), alg.permutation.to_bytes().hex()])
+
+    @staticmethod
+    def load(filename: str) -> AlgorithmLibrary:
+        """
+        Loads a library saved by AlgorithmLibrary.save. If the moves have changed since then (or the file has no key),
+        the permutations are computed again from the algorithms.
+        """
+        lib = AlgorithmLibrary()
+        with open(filename, "r", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            up_to_date = header[2:] == [_permutations_key()]
+            for (moves, permutation) in reader:
+                alg_moves = Move.parse(moves) if moves else []
+                if up_to_date:
+                    lib._add(Algorithm(tuple(alg_moves), Permutation.from_bytes(bytes.fromhex(permutation))))
+                else:
+                    lib._add(Algorithm(tuple(alg_moves), Permutation.of_moves(alg_moves)))
+        return lib
@@ -0,0 +1,252 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from enum import auto, Enum
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable
+import re
+
+from lib.rubiks_cube import CenterSticker, Color, CornerSticker, EdgeSticker, Layer, Move, RubiksCube
+
+
+Vector = tuple[int, int, int]
+
+_FACES = [Layer.U, Layer.F, Layer.R, Layer.B, Layer.L, Layer.D]
+_FACE_COLORS = [Color.WHITE, Color.GREEN, Color.RED, Color.BLUE, Color.ORANGE, Color.YELLOW]
+# Outward normal, then the directions of increasing column and increasing row when the face is drawn in the net
+_FACE_AXES: dict[Layer, tuple[Vector, Vector, Vector]] = {
+    Layer.U: ((0, 1, 0), (1, 0, 0), (0, 0, 1)),
+    Layer.F: ((0, 0, 1), (1, 0, 0), (0, -1, 0)),
+    Layer.R: ((1, 0, 0), (0, 0, -1), (0, -1, 0)),
+    Layer.B: ((0, 0, -1), (-1, 0, 0), (0, -1, 0)),
+    Layer.L: ((-1, 0, 0), (0, 0, 1), (0, -1, 0)),
+    Layer.D: ((0, -1, 0), (1, 0, 0), (0, 0, -1)),
+}
+# Face followed by slice moves (M, E, S) and whole-cube rotations (x, y, z)
+_SLICE_FACES = {"M": Layer.L, "E": Layer.D, "S": Layer.F}
+_ROTATION_FACES = {"X": Layer.R, "Y": Layer.U, "Z": Layer.F}
+_TURNS = {"": 1, "2": 2, "'": 3, "2'": 2}
+_MOVE_PATTERN = re.compile(r"^(?:([1-9]\d*)?([UFRBLD])(w?)|([MESXYZxyz]))(2'|2|'|)$")
+_MIDDLE = 0
+_ALL = -1
+
+
+def _dot(a: Vector, b: Vector) -> int:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _rotate_cw(p: Vector, axis: Vector) -> Vector:
+    """
+    Rotates p by a quarter turn clockwise, as seen when looking at the cube from the end of the axis.
+    """
+    (a, b) = (axis, p)
+    cross = (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+    d = _dot(a, b)
+    return (a[0] * d - cross[0], a[1] * d - cross[1], a[2] * d - cross[2])
+
+
+class FaceletType(Enum):
+    CENTER = auto()
+    CORNER = auto()
+    MIDGE = auto()
+    WING = auto()
+    X_CENTER = auto()
+    T_CENTER = auto()
+    OBLIQUE = auto()
+
+
+@dataclass(frozen=True)
+class BigMove:
+    """
+    Quarter turns of the layers first to last (1 being the outer layer) of the given face. first is 0 for the middle
+    slice of an odd cube (M, E, S) and last is -1 for the whole cube (x, y, z).
+    """
+    face: Layer
+    first: int
+    last: int
+    turns: int
+
+    def layers(self: BigMove, n: int) -> range:
+        if self.first == _MIDDLE:
+            if n % 2 == 0:
+                raise ValueError(f"There is no middle slice on a {n}x{n} cube.")
+            return range((n + 1) // 2, (n + 1) // 2 + 1)
+        last = n if self.last == _ALL else self.last
+        if not 1 <= self.first <= last <= n:
+            raise ValueError(f"Invalid move '{self}' on a {n}x{n} cube.")
+        return range(self.first, last + 1)
+
+    @staticmethod
+    def _parse(move: str) -> BigMove:
+        match = _MOVE_PATTERN.match(move)
+        if match is None:
+            raise ValueError(f"Invalid move '{move}'.")
+        (depth, face, wide, other, suffix) = match.groups()
+        turns = _TURNS[suffix]
+        if other is not None:
+            other = other.upper()
+            if other in _SLICE_FACES:
+                return BigMove(_SLICE_FACES[other], _MIDDLE, _MIDDLE, turns)
+            return BigMove(_ROTATION_FACES[other], 1, _ALL, turns)
+        depth = int(depth) if depth else (2 if wide else 1)
+        return BigMove(Layer[face], 1 if wide else depth, depth, turns)
+
+    @staticmethod
+    def parse(moves: str) -> list[BigMove]:
+        return [BigMove._parse(m) for m in moves.replace("(", "").replace(")", "").split()]
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def from_move(m: Move) -> BigMove:
+        """
+        Equivalent of a 3x3 move.
+        """
+        return BigMove._parse(str(m))
+
+    def __str__(self: BigMove) -> str:
+        suffix = {1: "", 2: "2", 3: "'"}[self.turns]
+        if self.first == _MIDDLE:
+            name = next(k for (k, v) in _SLICE_FACES.items() if v is self.face)
+        elif self.last == _ALL:
+            name = next(k for (k, v) in _ROTATION_FACES.items() if v is self.face).lower()
+        elif self.first == 1 and self.last > 1:
+            name = ("" if self.last == 2 else str(self.last)) + str(self.face) + "w"
+        else:
+            name = ("" if self.first == 1 else str(self.first)) + str(self.face)
+        return name + suffix
+
+
+@lru_cache(maxsize=None)
+def _facelets(n: int) -> tuple[list[tuple[Vector, Vector]], dict[tuple[Vector, Vector], int]]:
+    """
+    Position of the cubie and outward normal of each facelet (using coordinates from -(n - 1) to n - 1 in steps of
+    2), and the index of each (position, normal) pair.
+    """
+    out: list[tuple[Vector, Vector]] = []
+    for face in _FACES:
+        (normal, right, down) = _FACE_AXES[face]
+        for row in range(n):
+            for col in range(n):
+                (r, d) = (2 * col - (n - 1), 2 * row - (n - 1))
+                pos = tuple((n - 1) * normal[k] + r * right[k] + d * down[k] for k in range(3))
+                out.append((pos, normal))
+    return (out, {f: i for (i, f) in enumerate(out)})
+
+
+@lru_cache(maxsize=None)
+def _layer_permutation(n: int, face: Layer, depth: int) -> tuple[int, ...]:
+    """
+    Facelet permutation for a clockwise quarter turn of a single layer: after the turn, facelet i has the color
+    previously at index p[i].
+    """
+    (facelets, index) = _facelets(n)
+    axis = _FACE_AXES[face][0]
+    coordinate = n - 1 - 2 * (depth - 1)
+    p = list(range(len(facelets)))
+    for (i, (pos, normal)) in enumerate(facelets):
+        if _dot(pos, axis) == coordinate:
+            p[index[(_rotate_cw(pos, axis), _rotate_cw(normal, axis))]] = i
+    return tuple(p)
+
+
+def _compose(p: tuple[int, ...], q: tuple[int, ...]) -> tuple[int, ...]:
+    """
+    Permutation p followed by q.
+    """
+    return tuple(p[i] for i in q)
+
+
+@lru_cache(maxsize=None)
+def _move_permutation(n: int, m: BigMove) -> Callable[[bytes], tuple[int, ...]]:
+    p = tuple(range(6 * n * n))
+    for depth in m.layers(n):
+        for _ in range(m.turns):
+            p = _compose(p, _layer_permutation(n, m.face, depth))
+    return itemgetter(*p)
+
+
+class BigCube:
+    """
+    NxN cube stored as one byte per facelet (the value of its Color). Facelets are ordered by face (U, F, R, B, L, D,
+    as in CenterSticker) and then row by row, in the orientation used by RubiksCubeDrawer.
+    """
+
+    def __init__(self: BigCube, n: int, facelets: bytes | None = None) -> None:
+        """
+        By default, initializes a solved cube with green front and white top.
+        """
+        if n < 2:
+            raise ValueError(f"Invalid cube size {n}.")
+        self.n = n
+        if facelets is None:
+            facelets = bytes(c.value for c in _FACE_COLORS for _ in range(n * n))
+        elif len(facelets) != 6 * n * n:
+            raise ValueError(f"Expected {6 * n * n} facelets, got {len(facelets)}.")
+        self._facelets = facelets
+
+    def apply(self: BigCube, moves: list[BigMove]) -> BigCube:
+        facelets = self._facelets
+        for m in moves:
+            facelets = bytes(_move_permutation(self.n, m)(facelets))
+        return BigCube(self.n, facelets)
+
+    def color(self: BigCube, face: Layer, row: int, col: int) -> Color:
+        return Color(self._facelets[(_FACES.index(face) * self.n + row) * self.n + col])
+
+    def face_colors(self: BigCube, face: Layer) -> list[list[Color]]:
+        return [[self.color(face, row, col) for col in range(self.n)] for row in range(self.n)]
+
+    def is_solved(self: BigCube) -> bool:
+        """
+        Checks whether each face has a single color, in any orientation.
+        """
+        size = self.n * self.n
+        return all(len(set(self._facelets[i:i + size])) == 1 for i in range(0, 6 * size, size))
+
+    def facelet_type(self: BigCube, row: int, col: int) -> FaceletType:
+        n = self.n
+        (a, b) = (min(row, n - 1 - row), min(col, n - 1 - col))
+        middle = (n - 1) / 2
+        if a == 0 and b == 0:
+            return FaceletType.CORNER
+        elif a == 0 or b == 0:
+            return FaceletType.MIDGE if max(a, b) == middle else FaceletType.WING
+        elif a == b:
+            return FaceletType.CENTER if a == middle else FaceletType.X_CENTER
+        elif a == middle or b == middle:
+            return FaceletType.T_CENTER
+        else:
+            return FaceletType.OBLIQUE
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _sticker_index(sticker: CenterSticker | CornerSticker | EdgeSticker) -> int:
+        """
+        Index on a 3x3 cube of the facelet with the given name (e.g., "FLU" is the F facelet touching L and U).
+        """
+        faces = [Layer[c] for c in sticker.name]
+        pos = tuple(2 * sum(_FACE_AXES[f][0][k] for f in faces) for k in range(3))
+        return _facelets(3)[1][(pos, _FACE_AXES[faces[0]][0])]
+
+    @staticmethod
+    def from_rubiks_cube(rc: RubiksCube) -> BigCube:
+        facelets = bytearray(54)
+        for (sticker, color) in rc.sticker_colors().items():
+            facelets[BigCube._sticker_index(sticker)] = color.value
+        return BigCube(3, bytes(facelets))
+
+    def to_rubiks_cube(self: BigCube) -> RubiksCube:
+        if self.n != 3:
+            raise ValueError(f"Cannot convert a {self.n}x{self.n} cube to a Rubik's Cube.")
+        def colors(stickers: type) -> list[Color]:
+            return [Color(self._facelets[BigCube._sticker_index(s)]) for s in stickers]
+        return RubiksCube(colors(CenterSticker), colors(CornerSticker), colors(EdgeSticker))
+
+    def __eq__(self: BigCube, o: object) -> bool:
+        """
+        Checks whether two cubes are equal, *including overall orientation*.
+        """
+        return isinstance(o, BigCube) and self.n == o.n and self._facelets == o._facelets
+
+    def __hash__(self: BigCube) -> int:
+        return hash((self.n, self._facelets))
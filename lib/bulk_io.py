@@ -0,0 +1,221 @@
+from __future__ import annotations
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+import csv
+import heapq
+import io
+import os
+import sqlite3
+import struct
+
+from lib.result import HEADER_ROW, Result, result_to_row, row_to_result, TARGETS
+from lib.rubiks_cube import Move
+from lib.solver import Target
+
+
+_COLUMNAR_MAGIC = b"BLDR"
+_COLUMNAR_VERSION = 1
+_MOVE_LIST = list(Move)
+_MOVE_INDEX = {str(m): i for (i, m) in enumerate(_MOVE_LIST)}
+_EPOCH = datetime(1970, 1, 1)
+
+
+def split(filename: str, n_chunks: int) -> list[tuple[int, int]]:
+    """
+    Byte ranges of roughly equal size covering the rows of a results file (excluding the header). Each range starts
+    and ends at a row boundary.
+    """
+    size = os.path.getsize(filename)
+    with open(filename, "rb") as f:
+        f.readline()
+        start = f.tell()
+        bounds = [start]
+        for i in range(1, n_chunks):
+            f.seek(max(bounds[-1], start + (size - start) * i // n_chunks))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(a, b) for (a, b) in zip(bounds, bounds[1:]) if a < b]
+
+
+def parse_chunk(filename: str, start: int, end: int) -> list[list[str]]:
+    """
+    Rows in the given byte range of a results file, sorted by start time. Every row is parsed to check that it is
+    valid, but the rows themselves are returned since they are much cheaper to send between processes than results.
+    """
+    with open(filename, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    rows = [row for row in csv.reader(io.StringIO(data.decode(), newline="")) if row]
+    for row in rows:
+        row_to_result(row)
+    # Start times all have the same format, so sorting them as strings sorts them chronologically
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def merge(sorted_batches: Iterable[list[list[str]]]) -> Iterator[list[str]]:
+    """
+    Merges batches of rows sorted by start time, dropping rows with the same start time and scramble as an earlier
+    one.
+    """
+    seen: set[tuple[str, str]] = set()
+    for row in heapq.merge(*sorted_batches, key=lambda row: row[0]):
+        key = (row[0], row[1])
+        if key not in seen:
+            seen.add(key)
+            yield row
+
+
+def read_rows(filenames: list[str], jobs: int | None = None, chunks_per_job: int = 4) -> list[list[str]]:
+    """
+    Reads the results files in parallel chunks, then merges them by start time without duplicates. The rows are only
+    parsed (to check them) in the workers: the merge compares them as strings and the writers encode them directly, so
+    no results are built in this process. Use result.row_to_result to turn the rows into results.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    tasks = [(f, start, end) for f in filenames for (start, end) in split(f, jobs * chunks_per_job)]
+    if jobs == 1 or len(tasks) <= 1:
+        batches = [parse_chunk(*t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            batches = list(executor.map(parse_chunk, *zip(*tasks)))
+    return list(merge(batches))
+
+
+def _str_row(result: Result) -> list[str]:
+    return ["" if x is None else str(x) for x in result_to_row(result)]
+
+
+def write_csv(rows: Iterable[list[str]], filename: str) -> None:
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER_ROW)
+        writer.writerows(rows)
+
+
+def write_sqlite(rows: Iterable[list[str]], filename: str) -> None:
+    if os.path.exists(filename):
+        os.remove(filename)
+    with sqlite3.connect(filename) as conn:
+        conn.execute(
+            "CREATE TABLE results ("
+            "start_utc TEXT, scramble TEXT, duration_millis INTEGER, edge_solution TEXT, corner_solution TEXT, "
+            "success INTEGER, game_mode TEXT, PRIMARY KEY (start_utc, scramble))"
+        )
+        conn.executemany(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (start, scramble, None if duration == "" else int(duration), edges, corners, success == "True", mode)
+                for (start, scramble, duration, edges, corners, success, mode) in rows
+            )
+        )
+    conn.close()
+
+
+def _write_array(f: io.BufferedWriter, a: array) -> None:
+    f.write(struct.pack("<cQ", a.typecode.encode(), len(a)))
+    f.write(a.tobytes())
+
+
+def _read_array(data: memoryview, pos: int) -> tuple[array, int]:
+    (typecode, n) = struct.unpack_from("<cQ", data, pos)
+    pos += struct.calcsize("<cQ")
+    a = array(typecode.decode())
+    size = n * a.itemsize
+    a.frombytes(data[pos:pos + size])
+    return (a, pos + size)
+
+
+def write_columnar(rows: Iterable[list[str]], filename: str) -> None:
+    """
+    Binary file with one array per column. Moves and targets are stored as one byte each, with an offsets array
+    marking where each row's list starts.
+    """
+    start = array("q")
+    duration = array("q")
+    success = array("B")
+    game_mode = array("H")
+    game_modes: dict[str, int] = {}
+    lists = {name: (array("B"), array("I", [0])) for name in ["scramble", "edge_solution", "corner_solution"]}
+    (scrambles, scramble_offsets) = lists["scramble"]
+    (edges, edge_offsets) = lists["edge_solution"]
+    (corners, corner_offsets) = lists["corner_solution"]
+    for (start_utc, scramble, duration_millis, edge_solution, corner_solution, row_success, mode) in rows:
+        start.append((datetime.fromisoformat(start_utc.removesuffix("Z")) - _EPOCH) // timedelta(seconds=1))
+        duration.append(-1 if duration_millis == "" else int(duration_millis))
+        success.append(row_success == "True")
+        game_mode.append(game_modes.setdefault(mode, len(game_modes)))
+        scrambles.extend([_MOVE_INDEX[m] for m in scramble.split()])
+        scramble_offsets.append(len(scrambles))
+        edges.extend([TARGETS[t].value for t in edge_solution])
+        edge_offsets.append(len(edges))
+        corners.extend([TARGETS[t].value for t in corner_solution])
+        corner_offsets.append(len(corners))
+    with open(filename, "wb") as f:
+        f.write(struct.pack("<4sH", _COLUMNAR_MAGIC, _COLUMNAR_VERSION))
+        names = "\n".join(game_modes).encode()
+        f.write(struct.pack("<I", len(names)) + names)
+        for a in [start, duration, success, game_mode]:
+            _write_array(f, a)
+        for (data, offsets) in lists.values():
+            _write_array(f, data)
+            _write_array(f, offsets)
+
+
+def read_columnar(filename: str) -> list[Result]:
+    with open(filename, "rb") as f:
+        data = memoryview(f.read())
+    (magic, version) = struct.unpack_from("<4sH", data, 0)
+    if magic != _COLUMNAR_MAGIC or version != _COLUMNAR_VERSION:
+        raise ValueError(f"'{filename}' is not a results file.")
+    pos = struct.calcsize("<4sH")
+    (n_names,) = struct.unpack_from("<I", data, pos)
+    pos += 4
+    game_modes = bytes(data[pos:pos + n_names]).decode().split("\n")
+    pos += n_names
+    columns: list[array] = []
+    for _ in range(10):
+        (a, pos) = _read_array(data, pos)
+        columns.append(a)
+    (start, duration, success, game_mode, scramble, scramble_offsets, edges, edge_offsets, corners, corner_offsets) = (
+        columns
+    )
+    targets = list(Target)
+    return [
+        Result(
+            _EPOCH + timedelta(seconds=start[i]),
+            [_MOVE_LIST[m] for m in scramble[scramble_offsets[i]:scramble_offsets[i + 1]]],
+            None if duration[i] < 0 else timedelta(milliseconds=duration[i]),
+            [targets[t - 1] for t in edges[edge_offsets[i]:edge_offsets[i + 1]]],
+            [targets[t - 1] for t in corners[corner_offsets[i]:corner_offsets[i + 1]]],
+            bool(success[i]),
+            game_modes[game_mode[i]]
+        )
+        for i in range(len(start))
+    ]
+
+
+def write_rows(rows: list[list[str]], filename: str, format: str | None = None) -> None:
+    """
+    Writes the rows as CSV, SQLite or columnar binary, based on the format or else the file extension.
+    """
+    if format is None:
+        format = {".db": "sqlite", ".sqlite": "sqlite", ".bin": "columnar"}.get(os.path.splitext(filename)[1], "csv")
+    if os.path.dirname(filename):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+    match format:
+        case "csv":
+            write_csv(rows, filename)
+        case "sqlite":
+            write_sqlite(rows, filename)
+        case "columnar":
+            write_columnar(rows, filename)
+        case _:
+            raise ValueError(f"Invalid format '{format}'.")
+
+
+def write(results: list[Result], filename: str, format: str | None = None) -> None:
+    write_rows([_str_row(r) for r in results], filename, format)
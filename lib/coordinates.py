@@ -0,0 +1,442 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from math import factorial
+from typing import Iterable
+
+import numpy as np
+
+from lib.rubiks_cube import Color, CornerSticker, EdgeSticker, RubiksCube
+
+
+CO = CornerSticker
+E = EdgeSticker
+
+# Stickers of each corner position, starting from the U/D sticker and going clockwise
+CORNER_POSITIONS = [
+    (CO.UBL, CO.LBU, CO.BLU),
+    (CO.UBR, CO.BRU, CO.RBU),
+    (CO.UFR, CO.RFU, CO.FRU),
+    (CO.UFL, CO.FLU, CO.LFU),
+    (CO.DFL, CO.LDF, CO.FDL),
+    (CO.DFR, CO.FDR, CO.RDF),
+    (CO.DBR, CO.RBD, CO.BDR),
+    (CO.DBL, CO.BDL, CO.LBD),
+]
+# Stickers of each edge position, starting from the U/D sticker (or F/B sticker for E-slice edges)
+EDGE_POSITIONS = [
+    (E.UB, E.BU),
+    (E.UR, E.RU),
+    (E.UF, E.FU),
+    (E.UL, E.LU),
+    (E.FR, E.RF),
+    (E.FL, E.LF),
+    (E.BR, E.RB),
+    (E.BL, E.LB),
+    (E.DF, E.FD),
+    (E.DR, E.RD),
+    (E.DB, E.BD),
+    (E.DL, E.LD),
+]
+
+N_CORNER_PERMUTATIONS = factorial(len(CORNER_POSITIONS))
+N_CORNER_TWISTS = 3 ** (len(CORNER_POSITIONS) - 1)
+N_EDGE_PERMUTATIONS = factorial(len(EDGE_POSITIONS))
+N_EDGE_FLIPS = 2 ** (len(EDGE_POSITIONS) - 1)
+# The edge permutation has the same parity as the corner permutation, so only half of them are reachable
+N_STATE_IDS = N_CORNER_PERMUTATIONS * N_CORNER_TWISTS * (N_EDGE_PERMUTATIONS // 2) * N_EDGE_FLIPS
+
+_SOLVED = RubiksCube()
+_CORNER_COLORS = [tuple(_SOLVED._corners[s.value] for s in p) for p in CORNER_POSITIONS]
+_EDGE_COLORS = [tuple(_SOLVED._edges[s.value] for s in p) for p in EDGE_POSITIONS]
+# (piece, orientation) for each possible tuple of colors on a position
+_CORNER_LOOKUP = {
+    colors[-t:] + colors[:-t]: (piece, t)
+    for (piece, colors) in enumerate(_CORNER_COLORS)
+    for t in range(3)
+}
+_EDGE_LOOKUP = {
+    colors[f:] + colors[:f]: (piece, f)
+    for (piece, colors) in enumerate(_EDGE_COLORS)
+    for f in range(2)
+}
+_FACTORIALS = [factorial(i) for i in range(len(EDGE_POSITIONS) + 1)]
+# Number of state IDs for each value of the corner coordinates, i.e., the part of the state ID from the edges
+_EDGE_STATES = (N_EDGE_PERMUTATIONS // 2) * N_EDGE_FLIPS
+# Corner and edge (permutation, orientation) arrays with one row per cube
+BatchPieces = tuple[tuple[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]
+
+
+def permutation_rank(p: list[int]) -> int:
+    """
+    Lexicographic rank of a permutation of 0, ..., n - 1 (i.e., its Lehmer code read as a factorial-base number).
+    """
+    n = len(p)
+    rank = 0
+    seen = 0
+    for (i, x) in enumerate(p):
+        smaller_unused = x - (seen & ((1 << x) - 1)).bit_count()
+        rank += smaller_unused * _FACTORIALS[n - 1 - i]
+        seen |= 1 << x
+    return rank
+
+
+@lru_cache(maxsize=None)
+def _unused(seen: int, n: int) -> tuple[int, ...]:
+    return tuple(x for x in range(n) if not seen & (1 << x))
+
+
+def permutation_unrank(rank: int, n: int) -> list[int]:
+    out: list[int] = []
+    seen = 0
+    for i in range(n - 1, -1, -1):
+        (q, rank) = divmod(rank, _FACTORIALS[i])
+        x = _unused(seen, n)[q]
+        out.append(x)
+        seen |= 1 << x
+    return out
+
+
+def rank_parity(rank: int, n: int) -> int:
+    """
+    Parity of the permutation with the given lexicographic rank, without unranking it: the digits of the rank in the
+    factorial base count the inversions of the permutation.
+    """
+    digit_sum = 0
+    for base in range(2, n + 1):
+        (rank, d) = divmod(rank, base)
+        digit_sum += d
+    return digit_sum % 2
+
+
+def permutation_parity(p: list[int]) -> int:
+    seen = [False] * len(p)
+    n_cycles = 0
+    for i in range(len(p)):
+        if not seen[i]:
+            n_cycles += 1
+            while not seen[i]:
+                seen[i] = True
+                i = p[i]
+    return (len(p) - n_cycles) % 2
+
+
+def orientation_rank(o: list[int], base: int) -> int:
+    """
+    Rank of the orientations of all pieces but the last one, which is determined by the others.
+    """
+    rank = 0
+    for x in o[:-1]:
+        rank = rank * base + x
+    return rank
+
+
+def orientation_unrank(rank: int, n: int, base: int) -> list[int]:
+    out = [0] * n
+    for i in range(n - 2, -1, -1):
+        (rank, out[i]) = divmod(rank, base)
+    out[-1] = -sum(out[:-1]) % base
+    return out
+
+
+def _pieces(
+    stickers: list[Color],
+    positions: list[tuple],
+    lookup: dict[tuple[Color, ...], tuple[int, int]]
+) -> tuple[list[int], list[int]]:
+    permutation: list[int] = []
+    orientation: list[int] = []
+    for p in positions:
+        colors = tuple(stickers[s.value] for s in p)
+        try:
+            (piece, o) = lookup[colors]
+        except KeyError:
+            raise ValueError(f"Invalid piece with colors {colors} at {p[0]}.")
+        permutation.append(piece)
+        orientation.append(o)
+    return (permutation, orientation)
+
+
+def corner_pieces(rc: RubiksCube) -> tuple[list[int], list[int]]:
+    """
+    Corner piece at each position of CORNER_POSITIONS and its clockwise twist (0, 1 or 2). The cube must be in the
+    default orientation.
+    """
+    return _pieces(rc._corners, CORNER_POSITIONS, _CORNER_LOOKUP)
+
+
+def edge_pieces(rc: RubiksCube) -> tuple[list[int], list[int]]:
+    """
+    Edge piece at each position of EDGE_POSITIONS and whether it is flipped (0 or 1). The cube must be in the default
+    orientation.
+    """
+    return _pieces(rc._edges, EDGE_POSITIONS, _EDGE_LOOKUP)
+
+
+def _stickers(permutation: list[int], orientation: list[int], positions: list[tuple], colors: list[tuple]) -> list[Color]:
+    out: list[Color | None] = [None] * sum(len(p) for p in positions)
+    for (p, (piece, o)) in enumerate(zip(permutation, orientation)):
+        c = colors[piece]
+        for (s, color) in zip(positions[p], c[-o:] + c[:-o] if o else c):
+            out[s.value] = color
+    return out
+
+
+@dataclass(frozen=True)
+class Coordinates:
+    corner_permutation: int
+    corner_twist: int
+    edge_permutation: int
+    edge_flip: int
+
+    @staticmethod
+    def of(rc: RubiksCube) -> Coordinates:
+        """
+        Coordinates of the cube, after rotating it into the default orientation.
+        """
+        rc = rc.orient()
+        (cp, co) = corner_pieces(rc)
+        (ep, eo) = edge_pieces(rc)
+        return Coordinates(
+            permutation_rank(cp),
+            orientation_rank(co, 3),
+            permutation_rank(ep),
+            orientation_rank(eo, 2)
+        )
+
+    def to_cube(self: Coordinates) -> RubiksCube:
+        n_corners = len(CORNER_POSITIONS)
+        n_edges = len(EDGE_POSITIONS)
+        return RubiksCube(
+            list(_SOLVED._centers),
+            _stickers(
+                permutation_unrank(self.corner_permutation, n_corners),
+                orientation_unrank(self.corner_twist, n_corners, 3),
+                CORNER_POSITIONS,
+                _CORNER_COLORS
+            ),
+            _stickers(
+                permutation_unrank(self.edge_permutation, n_edges),
+                orientation_unrank(self.edge_flip, n_edges, 2),
+                EDGE_POSITIONS,
+                _EDGE_COLORS
+            )
+        )
+
+    def parity(self: Coordinates) -> int:
+        """
+        Parity of the corner permutation, which is also the parity of the edge permutation in reachable states.
+        """
+        return rank_parity(self.corner_permutation, len(CORNER_POSITIONS))
+
+    def state_id(self: Coordinates) -> int:
+        """
+        Single integer identifying the state, between 0 and N_STATE_IDS (about 2^65.2).
+        Lexicographic ranks 2k and 2k + 1 differ by a swap of the last two pieces, so the parity of the corner
+        permutation determines which one of them is the edge permutation.
+        """
+        if self.parity() != rank_parity(self.edge_permutation, len(EDGE_POSITIONS)):
+            raise ValueError("Unreachable state: the corner and edge permutations have different parities.")
+        x = self.corner_permutation
+        x = x * N_CORNER_TWISTS + self.corner_twist
+        x = x * (N_EDGE_PERMUTATIONS // 2) + self.edge_permutation // 2
+        x = x * N_EDGE_FLIPS + self.edge_flip
+        return x
+
+    @staticmethod
+    def from_state_id(x: int) -> Coordinates:
+        if not 0 <= x < N_STATE_IDS:
+            raise ValueError(f"Invalid state ID {x}.")
+        (x, eo) = divmod(x, N_EDGE_FLIPS)
+        (x, half_ep) = divmod(x, N_EDGE_PERMUTATIONS // 2)
+        (cp, co) = divmod(x, N_CORNER_TWISTS)
+        ep = 2 * half_ep
+        if rank_parity(ep, len(EDGE_POSITIONS)) != rank_parity(cp, len(CORNER_POSITIONS)):
+            ep += 1
+        return Coordinates(cp, co, ep, eo)
+
+
+def state_id(rc: RubiksCube) -> int:
+    return Coordinates.of(rc).state_id()
+
+
+def cube_from_state_id(x: int) -> RubiksCube:
+    return Coordinates.from_state_id(x).to_cube()
+
+
+def batch_permutation_rank(p: np.ndarray) -> np.ndarray:
+    """
+    Same as permutation_rank for each row.
+    """
+    n = p.shape[1]
+    # Number of later entries smaller than each entry, i.e., the digits of the Lehmer code
+    digits = np.triu(p[:, :, None] > p[:, None, :], k=1).sum(axis=2)
+    return digits @ np.array([_FACTORIALS[n - 1 - i] for i in range(n)], dtype=np.int64)
+
+
+def batch_permutation_unrank(ranks: np.ndarray, n: int) -> np.ndarray:
+    unused = np.ones((len(ranks), n), dtype=bool)
+    out = np.empty((len(ranks), n), dtype=np.int8)
+    rows = np.arange(len(ranks))
+    for i in range(n - 1, -1, -1):
+        (q, ranks) = np.divmod(ranks, _FACTORIALS[i])
+        # The q-th unused entry comes right after the last position with at most q unused entries up to it
+        x = (np.cumsum(unused, axis=1) <= q[:, None]).sum(axis=1)
+        out[:, n - 1 - i] = x
+        unused[rows, x] = False
+    return out
+
+
+def batch_rank_parity(ranks: np.ndarray, n: int) -> np.ndarray:
+    digit_sum = np.zeros(len(ranks), dtype=np.int64)
+    for base in range(2, n + 1):
+        (ranks, d) = np.divmod(ranks, base)
+        digit_sum += d
+    return digit_sum % 2
+
+
+def batch_orientation_rank(o: np.ndarray, base: int) -> np.ndarray:
+    n = o.shape[1]
+    return o[:, :-1].astype(np.int64) @ (base ** np.arange(n - 2, -1, -1, dtype=np.int64))
+
+
+def batch_orientation_unrank(ranks: np.ndarray, n: int, base: int) -> np.ndarray:
+    out = np.zeros((len(ranks), n), dtype=np.int8)
+    for i in range(n - 2, -1, -1):
+        (ranks, out[:, i]) = np.divmod(ranks, base)
+    out[:, -1] = -out[:, :-1].sum(axis=1) % base
+    return out
+
+
+def _sticker_indices(positions: list[tuple]) -> np.ndarray:
+    return np.array([[s.value for s in p] for p in positions], dtype=np.intp)
+
+
+_N_COLOR_VALUES = max(c.value for c in Color) + 1
+_COLOR_OF_VALUE = {c.value: c for c in Color}
+_CORNER_INDICES = _sticker_indices(CORNER_POSITIONS)
+_EDGE_INDICES = _sticker_indices(EDGE_POSITIONS)
+
+
+def _color_code(colors: np.ndarray) -> np.ndarray:
+    """
+    Colors of each piece (along the last axis) read as a number in base _N_COLOR_VALUES.
+    """
+    return colors @ (_N_COLOR_VALUES ** np.arange(colors.shape[-1]))
+
+
+def _piece_table(lookup: dict[tuple[Color, ...], tuple[int, int]], n_orientations: int) -> np.ndarray:
+    """
+    Piece * n_orientations + orientation for each color code in lookup, or -1 for colors that are not a piece.
+    """
+    table = np.full(_N_COLOR_VALUES ** n_orientations, -1, dtype=np.int16)
+    for (colors, (piece, o)) in lookup.items():
+        table[_color_code(np.array([c.value for c in colors]))] = piece * n_orientations + o
+    return table
+
+
+def _sticker_table(colors: list[tuple], n_orientations: int) -> np.ndarray:
+    """
+    Color values of the stickers of a position holding each piece * n_orientations + orientation (as in _stickers).
+    """
+    return np.array(
+        [
+            [c[(k - o) % n_orientations].value for k in range(n_orientations)]
+            for c in colors
+            for o in range(n_orientations)
+        ],
+        dtype=np.int8
+    )
+
+
+_CORNER_PIECE_TABLE = _piece_table(_CORNER_LOOKUP, 3)
+_EDGE_PIECE_TABLE = _piece_table(_EDGE_LOOKUP, 2)
+_CORNER_STICKER_TABLE = _sticker_table(_CORNER_COLORS, 3)
+_EDGE_STICKER_TABLE = _sticker_table(_EDGE_COLORS, 2)
+
+
+def _batch_pieces(
+    stickers: np.ndarray,
+    indices: np.ndarray,
+    table: np.ndarray,
+    positions: list[tuple]
+) -> tuple[np.ndarray, np.ndarray]:
+    n_orientations = indices.shape[1]
+    # Without any cubes, the sticker array is empty rather than having one column per sticker
+    stickers = stickers.reshape(-1, indices.size)
+    pieces = table[_color_code(stickers[:, indices])]
+    if (pieces < 0).any():
+        (row, p) = np.argwhere(pieces < 0)[0]
+        colors = tuple(_COLOR_OF_VALUE[v] for v in stickers[row, indices[p]].tolist())
+        raise ValueError(f"Invalid piece with colors {colors} at {positions[p][0]}.")
+    return ((pieces // n_orientations).astype(np.int8), (pieces % n_orientations).astype(np.int8))
+
+
+def batch_pieces(cubes: list[RubiksCube]) -> BatchPieces:
+    """
+    Same as corner_pieces and edge_pieces for each cube, which must be in the default orientation.
+    """
+    corners = np.array([[c.value for c in rc._corners] for rc in cubes], dtype=np.intp)
+    edges = np.array([[c.value for c in rc._edges] for rc in cubes], dtype=np.intp)
+    return (
+        _batch_pieces(corners, _CORNER_INDICES, _CORNER_PIECE_TABLE, CORNER_POSITIONS),
+        _batch_pieces(edges, _EDGE_INDICES, _EDGE_PIECE_TABLE, EDGE_POSITIONS)
+    )
+
+
+def _batch_stickers(pieces: tuple[np.ndarray, np.ndarray], indices: np.ndarray, table: np.ndarray) -> np.ndarray:
+    (permutation, orientation) = pieces
+    out = np.empty((len(permutation), indices.size), dtype=np.int8)
+    out[:, indices] = table[permutation.astype(np.intp) * indices.shape[1] + orientation]
+    return out
+
+
+def cubes_from_pieces(pieces: BatchPieces) -> list[RubiksCube]:
+    """
+    Cube in the default orientation for each row of the piece arrays.
+    """
+    (corners, edges) = pieces
+    corner_stickers = _batch_stickers(corners, _CORNER_INDICES, _CORNER_STICKER_TABLE).tolist()
+    edge_stickers = _batch_stickers(edges, _EDGE_INDICES, _EDGE_STICKER_TABLE).tolist()
+    return [
+        RubiksCube(list(_SOLVED._centers), [_COLOR_OF_VALUE[v] for v in c], [_COLOR_OF_VALUE[v] for v in e])
+        for (c, e) in zip(corner_stickers, edge_stickers)
+    ]
+
+
+def state_ids(cubes: Iterable[RubiksCube]) -> list[int]:
+    """
+    Same as state_id for each cube, with the coordinates of all the cubes computed at once.
+    """
+    ((cp, co), (ep, eo)) = batch_pieces([rc.orient() for rc in cubes])
+    corner_ranks = batch_permutation_rank(cp)
+    edge_ranks = batch_permutation_rank(ep)
+    corner_parity = batch_rank_parity(corner_ranks, len(CORNER_POSITIONS))
+    if (corner_parity != batch_rank_parity(edge_ranks, len(EDGE_POSITIONS))).any():
+        raise ValueError("Unreachable state: the corner and edge permutations have different parities.")
+    corner_ids = corner_ranks * N_CORNER_TWISTS + batch_orientation_rank(co, 3)
+    edge_ids = edge_ranks // 2 * N_EDGE_FLIPS + batch_orientation_rank(eo, 2)
+    # State IDs do not fit in 64 bits, so the corner and edge parts are only combined as Python integers
+    return [c * _EDGE_STATES + e for (c, e) in zip(corner_ids.tolist(), edge_ids.tolist())]
+
+
+def cubes_from_state_ids(ids: Iterable[int]) -> list[RubiksCube]:
+    """
+    Same as cube_from_state_id for each state ID, with the pieces of all the cubes computed at once.
+    """
+    parts = []
+    for x in ids:
+        if not 0 <= x < N_STATE_IDS:
+            raise ValueError(f"Invalid state ID {x}.")
+        parts.append(divmod(x, _EDGE_STATES))
+    (corner_ids, edge_ids) = np.array(parts, dtype=np.int64).reshape(-1, 2).T
+    (cp, co) = np.divmod(corner_ids, N_CORNER_TWISTS)
+    (half_ep, eo) = np.divmod(edge_ids, N_EDGE_FLIPS)
+    ep = 2 * half_ep
+    ep += batch_rank_parity(ep, len(EDGE_POSITIONS)) != batch_rank_parity(cp, len(CORNER_POSITIONS))
+    n_corners = len(CORNER_POSITIONS)
+    n_edges = len(EDGE_POSITIONS)
+    return cubes_from_pieces((
+        (batch_permutation_unrank(cp, n_corners), batch_orientation_unrank(co, n_corners, 3)),
+        (batch_permutation_unrank(ep, n_edges), batch_orientation_unrank(eo, n_edges, 2))
+    ))
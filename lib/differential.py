@@ -0,0 +1,169 @@
+from __future__ import annotations
+from typing import Callable
+import random
+
+import numpy as np
+
+from lib.big_cube import BigCube, BigMove
+from lib.coordinates import Coordinates, cubes_from_pieces, orientation_rank, permutation_rank
+from lib.difficulty import apply_scrambles, scramble_pieces
+from lib.permutation import Permutation
+from lib.rubiks_cube import Move, RubiksCube
+from lib.scrambler import OUTER_TURNS
+from lib.simplifier import simplify
+from lib.solver import M2Solver, Target
+
+
+Engine = Callable[[list[Move]], RubiksCube]
+
+
+def _reference(moves: list[Move]) -> RubiksCube:
+    return RubiksCube().apply(moves)
+
+
+def _permutation(moves: list[Move]) -> RubiksCube:
+    return Permutation.of_moves(moves).apply(RubiksCube())
+
+
+def _big_cube(moves: list[Move]) -> RubiksCube:
+    return BigCube(3).apply([BigMove.from_move(m) for m in moves]).to_rubiks_cube()
+
+
+def _simplified(moves: list[Move]) -> RubiksCube:
+    return RubiksCube().apply(simplify(moves))
+
+
+def _outer_turns(moves: list[Move]) -> list[Move]:
+    return [m for m in moves if m.is_outer_turn()]
+
+
+def _outer_turn_reference(moves: list[Move]) -> RubiksCube:
+    return RubiksCube().apply(_outer_turns(moves))
+
+
+def _pieces(moves: list[Move]) -> RubiksCube:
+    ((cp, co), (ep, eo)) = scramble_pieces(_outer_turns(moves))
+    coordinates = Coordinates(
+        permutation_rank(cp),
+        orientation_rank(co, 3),
+        permutation_rank(ep),
+        orientation_rank(eo, 2)
+    )
+    return coordinates.to_cube()
+
+
+def _apply_scrambles(moves: list[Move]) -> RubiksCube:
+    index = {m: i for (i, m) in enumerate(OUTER_TURNS)}
+    return cubes_from_pieces(apply_scrambles(np.array([[index[m] for m in _outer_turns(moves)]], dtype=np.intp)))[0]
+
+
+_EDGE_TARGETS = [t for (t, a) in M2Solver._EDGE_ALGORITHMS.items() if a is not None]
+_CORNER_TARGETS = [t for (t, a) in M2Solver._CORNER_ALGORITHMS.items() if a is not None]
+_MOVE_INDEX = {m: i for (i, m) in enumerate(Move)}
+
+
+def _targets(moves: list[Move]) -> tuple[list[Target], list[Target]]:
+    """
+    Valid edge and corner targets picked by every other move, alternating between edges and corners, so that random
+    move sequences also give random target sequences. Every solution is replayed on the stickers by the reference, so
+    only using half of the moves keeps the solutions (and the reference) short.
+    """
+    return (
+        [_EDGE_TARGETS[_MOVE_INDEX[m] % len(_EDGE_TARGETS)] for m in moves[::4]],
+        [_CORNER_TARGETS[_MOVE_INDEX[m] % len(_CORNER_TARGETS)] for m in moves[2::4]]
+    )
+
+
+def _solution_reference(moves: list[Move]) -> RubiksCube:
+    return RubiksCube().apply(M2Solver.solution(*_targets(moves)))
+
+
+def _compiled_solution(moves: list[Move]) -> RubiksCube:
+    return M2Solver.apply_solution(RubiksCube(), *_targets(moves))
+
+
+REFERENCE = _reference
+# Engines that must produce exactly the same state as RubiksCube.apply
+ENGINES: dict[str, Engine] = {
+    "permutation": _permutation,
+    "big_cube": _big_cube,
+    "simplified": _simplified,
+    "pieces": _pieces,
+    "apply_scrambles": _apply_scrambles,
+    "compiled_solution": _compiled_solution,
+}
+# Engines that are checked against something else than REFERENCE: the piece models only take outer turns, so they
+# run on the outer turns of each sequence, and the compiled solver runs on targets picked by the moves
+REFERENCES: dict[str, Engine] = {
+    "pieces": _outer_turn_reference,
+    "apply_scrambles": _outer_turn_reference,
+    "compiled_solution": _solution_reference,
+}
+
+
+def random_moves(rng: random.Random, min_length: int, max_length: int) -> list[Move]:
+    moves = list(Move)
+    return [rng.choice(moves) for _ in range(rng.randint(min_length, max_length))]
+
+
+def mismatches(moves: list[Move], engines: dict[str, Engine]) -> list[str]:
+    """
+    Names of the engines whose result differs from their reference (or that raise an exception).
+    """
+    expected: dict[Engine, RubiksCube] = {}
+    out: list[str] = []
+    for (name, engine) in engines.items():
+        reference = REFERENCES.get(name, REFERENCE)
+        try:
+            if reference not in expected:
+                expected[reference] = reference(moves)
+            if engine(moves) != expected[reference]:
+                out.append(name)
+        except Exception:
+            out.append(name)
+    return out
+
+
+def shrink(moves: list[Move], name: str) -> list[Move]:
+    """
+    Removes moves from a failing sequence for as long as the engine keeps failing on it, first in large chunks and
+    then one by one.
+    """
+    def fails(m: list[Move]) -> bool:
+        return len(mismatches(m, {name: ENGINES[name]})) > 0
+    chunk = max(1, len(moves) // 2)
+    while True:
+        i = 0
+        while i < len(moves):
+            candidate = moves[:i] + moves[i + chunk:]
+            if fails(candidate):
+                moves = candidate
+            else:
+                i += chunk
+        if chunk == 1:
+            return moves
+        chunk = max(1, chunk // 2)
+
+
+def run(
+    seed: int,
+    n_cases: int,
+    engine_names: list[str],
+    min_length: int = 1,
+    max_length: int = 30
+) -> dict[str, tuple[str, int]]:
+    """
+    Runs random move sequences through the given engines and returns, for each engine that failed, the first failing
+    sequence and the number of failures. Only one sequence is kept per engine so that a broken engine cannot send
+    back a sequence for every case.
+    The arguments and the result are plain values so that batches can be run in worker processes.
+    """
+    rng = random.Random(seed)
+    engines = {name: ENGINES[name] for name in engine_names}
+    failures: dict[str, tuple[str, int]] = {}
+    for _ in range(n_cases):
+        moves = random_moves(rng, min_length, max_length)
+        for name in mismatches(moves, engines):
+            (first, count) = failures.get(name, (" ".join([str(m) for m in moves]), 0))
+            failures[name] = (first, count + 1)
+    return failures
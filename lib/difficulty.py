@@ -0,0 +1,318 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import random
+
+import numpy as np
+
+from lib.coordinates import BatchPieces, N_STATE_IDS, corner_pieces, cube_from_state_id, edge_pieces
+from lib.result import Result
+from lib.rubiks_cube import Move, RubiksCube
+from lib.scrambler import OUTER_TURNS
+
+
+# Solutions are entered with the cube rotated by z2, so the DF (M2) and UBL (Old Pochmann) buffers are the UF and DBR
+# positions of the scrambled cube (see coordinates.EDGE_POSITIONS and coordinates.CORNER_POSITIONS)
+_EDGE_BUFFER = 2
+_CORNER_BUFFER = 6
+STATS = [
+    "edge_targets",
+    "corner_targets",
+    "edge_cycle_breaks",
+    "corner_cycle_breaks",
+    "flipped_edges",
+    "twisted_corners",
+    "parity"
+]
+
+
+@dataclass(frozen=True)
+class ScrambleStats:
+    edge_targets: int
+    corner_targets: int
+    edge_cycle_breaks: int
+    corner_cycle_breaks: int
+    flipped_edges: int
+    twisted_corners: int
+
+    @property
+    def parity(self: ScrambleStats) -> bool:
+        return self.edge_targets % 2 == 1
+
+    @property
+    def targets(self: ScrambleStats) -> int:
+        return self.edge_targets + self.corner_targets
+
+
+def _cycle_stats(permutation: list[int], orientation: list[int], buffer: int) -> tuple[int, int, int]:
+    """
+    Number of targets, cycle breaks and pieces that are solved but misoriented. Pieces in the buffer's cycle take one
+    target each, while every other cycle takes an additional target to break into it and return from it.
+    """
+    seen = [False] * len(permutation)
+    targets = 0
+    breaks = 0
+    misoriented = 0
+    for start in [buffer] + list(range(len(permutation))):
+        if seen[start]:
+            continue
+        length = 0
+        i = start
+        while not seen[i]:
+            seen[i] = True
+            length += 1
+            i = permutation[i]
+        if start == buffer:
+            targets += length - 1
+        elif length > 1:
+            targets += length + 1
+            breaks += 1
+        elif orientation[start] != 0:
+            misoriented += 1
+    return (targets, breaks, misoriented)
+
+
+def _stats(corners: tuple[list[int], list[int]], edges: tuple[list[int], list[int]]) -> ScrambleStats:
+    (edge_targets, edge_breaks, flipped) = _cycle_stats(edges[0], edges[1], _EDGE_BUFFER)
+    (corner_targets, corner_breaks, twisted) = _cycle_stats(corners[0], corners[1], _CORNER_BUFFER)
+    return ScrambleStats(edge_targets, corner_targets, edge_breaks, corner_breaks, flipped, twisted)
+
+
+def cube_stats(rc: RubiksCube) -> ScrambleStats:
+    rc = rc.orient()
+    return _stats(corner_pieces(rc), edge_pieces(rc))
+
+
+def _piece_moves() -> dict[Move, tuple[tuple[list[int], list[int]], tuple[list[int], list[int]]]]:
+    """
+    Effect of each outer turn on the corner and edge pieces: the position each piece comes from and the orientation
+    it gains.
+    """
+    return {
+        m: (corner_pieces(RubiksCube().apply([m])), edge_pieces(RubiksCube().apply([m])))
+        for m in Move
+        if m.is_outer_turn()
+    }
+
+
+_PIECE_MOVES = _piece_moves()
+
+
+def _apply_pieces(
+    state: tuple[list[int], list[int]],
+    move: tuple[list[int], list[int]],
+    n_orientations: int
+) -> tuple[list[int], list[int]]:
+    (permutation, orientation) = state
+    (source, twist) = move
+    return (
+        [permutation[s] for s in source],
+        [(orientation[s] + t) % n_orientations for (s, t) in zip(source, twist)]
+    )
+
+
+def scramble_pieces(scramble: list[Move]) -> tuple[tuple[list[int], list[int]], tuple[list[int], list[int]]]:
+    """
+    Corner and edge pieces (as in corner_pieces and edge_pieces) after applying a scramble made only of outer turns to
+    a solved cube, without going through the stickers.
+    """
+    corners = (list(range(8)), [0] * 8)
+    edges = (list(range(12)), [0] * 12)
+    for m in scramble:
+        (corner_move, edge_move) = _PIECE_MOVES[m]
+        corners = _apply_pieces(corners, corner_move, 3)
+        edges = _apply_pieces(edges, edge_move, 2)
+    return (corners, edges)
+
+
+def scramble_stats(scramble: list[Move]) -> ScrambleStats:
+    """
+    Statistics of the cube after applying the scramble to a solved cube. Scrambles made only of outer turns are
+    applied to the pieces directly, which is much faster than applying them to the stickers.
+    """
+    if not all(m in _PIECE_MOVES for m in scramble):
+        return cube_stats(RubiksCube().apply(scramble))
+    return _stats(*scramble_pieces(scramble))
+
+
+# Number of moves applied at once by apply_scrambles
+_GROUP = 3
+_PADDING = len(OUTER_TURNS)
+
+
+def _move_sequences(moves: list[tuple[list[int], list[int]]], n_orientations: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sources and orientation changes (as in _PIECE_MOVES) of every sequence of _GROUP moves out of OUTER_TURNS and a
+    padding move that does nothing, indexed by the sequence read as a number in base len(OUTER_TURNS) + 1. The
+    orientation changes are multiplied by the number of pieces to match the encoding of _apply_sequences.
+    """
+    n_pieces = len(moves[0][0])
+    sources = np.array([m[0] for m in moves] + [list(range(n_pieces))], dtype=np.intp)
+    twists = np.array([m[1] for m in moves] + [[0] * n_pieces], dtype=np.intp)
+    (out_sources, out_twists) = (sources, twists)
+    for _ in range(_GROUP - 1):
+        # Every sequence followed by every move
+        out_twists = ((out_twists[:, sources] + twists[None, :, :]) % n_orientations).reshape(-1, n_pieces)
+        out_sources = out_sources[:, sources].reshape(-1, n_pieces)
+    return (out_sources, (out_twists * n_pieces).astype(np.int8))
+
+
+_CORNER_SEQUENCES = _move_sequences([c for (c, _) in (_PIECE_MOVES[m] for m in OUTER_TURNS)], 3)
+_EDGE_SEQUENCES = _move_sequences([e for (_, e) in (_PIECE_MOVES[m] for m in OUTER_TURNS)], 2)
+
+
+def _apply_sequences(sequences: np.ndarray, table: tuple[np.ndarray, np.ndarray], n_orientations: int) -> np.ndarray:
+    """
+    Pieces after applying each row of sequences to a solved cube, with the piece and orientation of each position
+    encoded as orientation * number of pieces + piece.
+    """
+    (sources, twists) = table
+    n_pieces = sources.shape[1]
+    size = n_pieces * n_orientations
+    # The first sequence applied to a solved cube gives its sources and twists
+    state = twists[sequences[:, 0]] + sources[sequences[:, 0]].astype(np.int8)
+    for j in range(1, sequences.shape[1]):
+        s = sequences[:, j]
+        state = (np.take_along_axis(state, sources[s], axis=1) + twists[s]) % size
+    return state
+
+
+def apply_scrambles(moves: np.ndarray) -> BatchPieces:
+    """
+    Corner and edge pieces (as in scramble_stats) after applying each row of moves, given as indices into OUTER_TURNS
+    (or len(OUTER_TURNS) for padding), to a solved cube. Moves are applied _GROUP at a time.
+    """
+    (n, length) = moves.shape
+    padded = np.full((n, max(1, -(-length // _GROUP)) * _GROUP), _PADDING, dtype=np.intp)
+    padded[:, :length] = moves
+    sequences = np.zeros((n, padded.shape[1] // _GROUP), dtype=np.intp)
+    for k in range(_GROUP):
+        sequences = sequences * (len(OUTER_TURNS) + 1) + padded[:, k::_GROUP]
+    corners = _apply_sequences(sequences, _CORNER_SEQUENCES, 3)
+    edges = _apply_sequences(sequences, _EDGE_SEQUENCES, 2)
+    return ((corners % 8, corners // 8), (edges % 12, edges // 12))
+
+
+def _cycle_labels(permutation: np.ndarray) -> np.ndarray:
+    """
+    Smallest position in the cycle of each position of each row. After k steps, label[i] is the smallest of the first
+    2^k positions in the cycle of i.
+    """
+    label = np.tile(np.arange(permutation.shape[1], dtype=permutation.dtype), (len(permutation), 1))
+    p = permutation
+    for _ in range((permutation.shape[1] - 1).bit_length()):
+        label = np.minimum(label, np.take_along_axis(label, p.astype(np.intp), axis=1))
+        p = np.take_along_axis(p, p.astype(np.intp), axis=1)
+    return label
+
+
+def _parity(permutation: np.ndarray) -> np.ndarray:
+    n_pieces = permutation.shape[1]
+    return (n_pieces - (_cycle_labels(permutation) == np.arange(n_pieces)).sum(axis=1)) % 2
+
+
+def _batch_cycle_stats(
+    permutation: np.ndarray,
+    orientation: np.ndarray,
+    buffer: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Same as _cycle_stats for each row: every unsolved piece takes one target (except the one in the buffer), and each
+    cycle away from the buffer takes one more.
+    """
+    positions = np.arange(permutation.shape[1])
+    label = _cycle_labels(permutation)
+    solved = permutation == positions
+    in_buffer_cycle = label == label[:, [buffer]]
+    breaks = ((label == positions) & ~in_buffer_cycle & ~solved).sum(axis=1)
+    targets = in_buffer_cycle.sum(axis=1) - 1 + (~solved & ~in_buffer_cycle).sum(axis=1) + breaks
+    misoriented = (solved & (orientation != 0) & (positions != buffer)).sum(axis=1)
+    return (targets, breaks, misoriented)
+
+
+def batch_stats(corners: tuple[np.ndarray, np.ndarray], edges: tuple[np.ndarray, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    Each statistic in STATS for every row of the piece arrays.
+    """
+    (edge_targets, edge_breaks, flipped) = _batch_cycle_stats(*edges, _EDGE_BUFFER)
+    (corner_targets, corner_breaks, twisted) = _batch_cycle_stats(*corners, _CORNER_BUFFER)
+    return {
+        "edge_targets": edge_targets,
+        "corner_targets": corner_targets,
+        "edge_cycle_breaks": edge_breaks,
+        "corner_cycle_breaks": corner_breaks,
+        "flipped_edges": flipped,
+        "twisted_corners": twisted,
+        "parity": edge_targets % 2
+    }
+
+
+def _to_scramble_stats(stats: dict[str, np.ndarray]) -> list[ScrambleStats]:
+    # The fields of ScrambleStats are all the statistics but the parity
+    columns = [stats[name].tolist() for name in STATS[:-1]]
+    return [ScrambleStats(*row) for row in zip(*columns)]
+
+
+def batch_scramble_stats(scrambles: list[list[Move]]) -> list[ScrambleStats]:
+    """
+    Same as scramble_stats for each scramble, computed on all of them at once if they are made only of outer turns.
+    """
+    if not all(m in _PIECE_MOVES for s in scrambles for m in s):
+        return [scramble_stats(s) for s in scrambles]
+    index = {m: i for (i, m) in enumerate(OUTER_TURNS)}
+    moves = np.full((len(scrambles), max((len(s) for s in scrambles), default=0)), _PADDING, dtype=np.intp)
+    for (i, s) in enumerate(scrambles):
+        moves[i, :len(s)] = [index[m] for m in s]
+    return _to_scramble_stats(batch_stats(*apply_scrambles(moves)))
+
+
+def random_states(rng: np.random.Generator, n: int) -> BatchPieces:
+    """
+    Corner and edge pieces of n uniformly random states.
+    """
+    pieces = []
+    for (n_pieces, n_orientations) in [(8, 3), (12, 2)]:
+        permutation = rng.permuted(np.tile(np.arange(n_pieces, dtype=np.int8), (n, 1)), axis=1)
+        orientation = rng.integers(0, n_orientations, (n, n_pieces), dtype=np.int8)
+        orientation[:, -1] = -orientation[:, :-1].sum(axis=1) % n_orientations
+        pieces.append((permutation, orientation))
+    ((cp, co), (ep, eo)) = pieces
+    # Swapping the last two edges makes the parity of the edge permutation match the corners without changing the
+    # distribution
+    swap = _parity(cp) != _parity(ep)
+    ep[swap, -2:] = ep[swap, -1:-3:-1]
+    return ((cp, co), (ep, eo))
+
+
+def random_state_stats(rng: random.Random) -> ScrambleStats:
+    """
+    Statistics of a uniformly random state, for comparison with the distribution of the scrambler.
+    """
+    return cube_stats(cube_from_state_id(rng.randrange(N_STATE_IDS)))
+
+
+def annotate(results: list[Result]) -> list[tuple[Result, ScrambleStats]]:
+    return list(zip(results, batch_scramble_stats([r.scramble for r in results])))
+
+
+def histograms(stats: list[ScrambleStats]) -> dict[str, dict[int, int]]:
+    """
+    Number of scrambles for each value of each statistic.
+    """
+    out: dict[str, dict[int, int]] = {}
+    for s in stats:
+        for name in STATS:
+            value = int(getattr(s, name))
+            h = out.setdefault(name, {})
+            h[value] = h.get(value, 0) + 1
+    return out
+
+
+def batch_histograms(stats: dict[str, np.ndarray]) -> dict[str, dict[int, int]]:
+    """
+    Same as histograms, for statistics computed by batch_stats.
+    """
+    out: dict[str, dict[int, int]] = {}
+    for name in STATS:
+        (values, counts) = np.unique(stats[name], return_counts=True)
+        out[name] = dict(zip(values.tolist(), counts.tolist()))
+    return out
@@ -3,7 +3,8 @@ try:
 except ImportError:
     colorama = None
 
-from lib.rubiks_cube import Color, RubiksCube
+from lib.big_cube import BigCube
+from lib.rubiks_cube import Color, Layer, RubiksCube
 
 
 class RubiksCubeDrawer:
@@ -57,3 +58,24 @@ class RubiksCubeDrawer:
             out = out.replace("^" + str(sticker) + "^", "^" + RubiksCubeDrawer._cell(color) + "^")
         out = out.replace("^", "")
         return out
+
+    @staticmethod
+    def draw_big(cube: BigCube) -> str:
+        """
+        Draws the unfolded cube, with the same layout as draw().
+        """
+        n = cube.n
+        border = "+" + "-" * (3 * n)
+        blank = " " * (3 * n + 1)
+        def row(faces: list[Layer], i: int) -> str:
+            return "".join(
+                "|" + "".join(RubiksCubeDrawer._cell(c) for c in cube.face_colors(face)[i]) for face in faces
+            ) + "|"
+        lines = [blank + border + "+"]
+        lines += [blank + row([Layer.U], i) for i in range(n)]
+        lines += [border * 4 + "+"]
+        lines += [row([Layer.L, Layer.F, Layer.R, Layer.B], i) for i in range(n)]
+        lines += [border * 4 + "+"]
+        lines += [blank + row([Layer.D], i) for i in range(n)]
+        lines += [blank + border + "+"]
+        return "\n".join(lines)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+import csv
+import heapq
+import os
+
+from lib.coordinates import CORNER_POSITIONS, EDGE_POSITIONS
+from lib.result import Result
+from lib.solver import M2Solver, Target
+
+
+_DRILL_FILENAME = "results/drill.csv"
+_HEADER_ROW = [
+    "piece_type",
+    "pair",
+    "due_utc",
+    "interval_days",
+    "ease",
+    "repetitions",
+    "lapses"
+]
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+_NEW_CARD_DUE = datetime(1970, 1, 1)
+_RELEARN_INTERVAL = timedelta(minutes=1)
+_MIN_EASE = 1.3
+
+
+class PieceType(Enum):
+    EDGE = "EDGE"
+    CORNER = "CORNER"
+
+    def __str__(self: PieceType) -> str:
+        return self.name
+
+
+def _pairs(algorithms: dict[Target, object], positions: list[tuple]) -> list[tuple[Target, Target]]:
+    """
+    All pairs of valid targets that are on different pieces.
+    """
+    piece = {s.value: i for (i, p) in enumerate(positions) for s in p}
+    targets = [t for (t, a) in algorithms.items() if a is not None]
+    return [
+        (a, b) for a in targets for b in targets
+        if piece[a.value - 1] != piece[b.value - 1]
+    ]
+
+
+_PAIRS = {
+    PieceType.EDGE: _pairs(M2Solver._EDGE_ALGORITHMS, EDGE_POSITIONS),
+    PieceType.CORNER: _pairs(M2Solver._CORNER_ALGORITHMS, CORNER_POSITIONS),
+}
+
+
+@dataclass
+class Card:
+    piece_type: PieceType
+    first: Target
+    second: Target
+    due: datetime = _NEW_CARD_DUE
+    interval_days: float = 0
+    ease: float = 2.5
+    repetitions: int = 0
+    lapses: int = 0
+
+    def key(self: Card) -> tuple[PieceType, Target, Target]:
+        return (self.piece_type, self.first, self.second)
+
+    def __str__(self: Card) -> str:
+        return f"{self.first}{self.second}"
+
+
+def _quality(success: bool, latency: timedelta) -> int:
+    """
+    SM-2 response quality (0-5) from whether the pair was recalled and how long it took.
+    """
+    if not success:
+        return 1
+    seconds = latency.total_seconds()
+    if seconds < 2:
+        return 5
+    elif seconds < 5:
+        return 4
+    else:
+        return 3
+
+
+class DrillScheduler:
+    """
+    SM-2 scheduler for letter pairs. Reviewed cards are kept in a heap ordered by due time, and cards that have never
+    been reviewed in a queue that is only used when no reviewed card is due. Every review appends the new state of the
+    card to the drill file, so loading only needs the last row for each card.
+    """
+
+    def __init__(self: DrillScheduler, filename: str = _DRILL_FILENAME) -> None:
+        self._filename = filename
+        self._cards: dict[tuple[PieceType, Target, Target], Card] = {
+            (piece_type, a, b): Card(piece_type, a, b)
+            for (piece_type, pairs) in _PAIRS.items()
+            for (a, b) in pairs
+        }
+        self._n_rows = 0
+        if os.path.exists(filename):
+            self._load()
+        # Entries are (due, sequence number, key); entries whose sequence number is outdated are skipped
+        self._sequence: dict[tuple[PieceType, Target, Target], int] = {}
+        self._heap: list[tuple[datetime, int, tuple[PieceType, Target, Target]]] = []
+        # Cards that have been reviewed since they were queued are skipped
+        self._new: deque[tuple[PieceType, Target, Target]] = deque()
+        for (i, card) in enumerate(self._cards.values()):
+            if card.due == _NEW_CARD_DUE:
+                self._new.append(card.key())
+            else:
+                self._sequence[card.key()] = i
+                self._heap.append((card.due, i, card.key()))
+        heapq.heapify(self._heap)
+        self._next_sequence = len(self._cards)
+
+    @property
+    def is_new(self: DrillScheduler) -> bool:
+        return self._n_rows == 0
+
+    def _load(self: DrillScheduler) -> None:
+        with open(self._filename, "r", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for (piece_type, pair, due_utc, interval_days, ease, repetitions, lapses) in reader:
+                self._n_rows += 1
+                key = (PieceType[piece_type], Target[pair[0]], Target[pair[1]])
+                if key not in self._cards:
+                    continue
+                self._cards[key] = Card(
+                    key[0],
+                    key[1],
+                    key[2],
+                    datetime.strptime(due_utc, _TIME_FORMAT),
+                    float(interval_days),
+                    float(ease),
+                    int(repetitions),
+                    int(lapses)
+                )
+        if self._n_rows > 2 * len(self._cards):
+            self._compact()
+
+    def _compact(self: DrillScheduler) -> None:
+        reviewed = [c for c in self._cards.values() if c.due != _NEW_CARD_DUE]
+        temp_filename = self._filename + ".tmp"
+        with open(temp_filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(_HEADER_ROW)
+            writer.writerows([DrillScheduler._to_row(c) for c in reviewed])
+        os.replace(temp_filename, self._filename)
+        self._n_rows = len(reviewed)
+
+    @staticmethod
+    def _to_row(card: Card) -> list:
+        return [
+            card.piece_type,
+            str(card),
+            card.due.strftime(_TIME_FORMAT),
+            card.interval_days,
+            round(card.ease, 4),
+            card.repetitions,
+            card.lapses
+        ]
+
+    def _save(self: DrillScheduler, cards: list[Card]) -> None:
+        if not os.path.exists(self._filename):
+            if os.path.dirname(self._filename):
+                os.makedirs(os.path.dirname(self._filename), exist_ok=True)
+            with open(self._filename, "w", newline="") as f:
+                csv.writer(f).writerow(_HEADER_ROW)
+        with open(self._filename, "a", newline="") as f:
+            csv.writer(f).writerows([DrillScheduler._to_row(c) for c in cards])
+        self._n_rows += len(cards)
+
+    def next_card(self: DrillScheduler, now: datetime | None = None) -> Card:
+        """
+        Reviewed card that is due the soonest if it is due now, else the next new card, else the reviewed card that
+        will be due the soonest.
+        """
+        if now is None:
+            now = datetime.utcnow()
+        while self._heap and self._sequence[self._heap[0][2]] != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        while self._new and self._cards[self._new[0]].due != _NEW_CARD_DUE:
+            self._new.popleft()
+        if self._heap and (self._heap[0][0] <= now or not self._new):
+            return self._cards[self._heap[0][2]]
+        return self._cards[self._new[0]]
+
+    def card(self: DrillScheduler, piece_type: PieceType, first: Target, second: Target) -> Card | None:
+        return self._cards.get((piece_type, first, second))
+
+    def _update(self: DrillScheduler, card: Card, success: bool, latency: timedelta, now: datetime) -> None:
+        q = _quality(success, latency)
+        if q < 3:
+            card.repetitions = 0
+            card.lapses += 1
+            card.interval_days = 0
+            card.due = now + _RELEARN_INTERVAL
+        else:
+            card.repetitions += 1
+            if card.repetitions == 1:
+                card.interval_days = 1
+            elif card.repetitions == 2:
+                card.interval_days = 6
+            else:
+                card.interval_days = round(card.interval_days * card.ease, 2)
+            card.due = now + timedelta(days=card.interval_days)
+        card.ease = max(_MIN_EASE, card.ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+        self._sequence[card.key()] = self._next_sequence
+        heapq.heappush(self._heap, (card.due, self._next_sequence, card.key()))
+        self._next_sequence += 1
+
+    def review(
+        self: DrillScheduler,
+        card: Card,
+        success: bool,
+        latency: timedelta,
+        now: datetime | None = None
+    ) -> None:
+        self._update(card, success, latency, datetime.utcnow() if now is None else now)
+        self._save([card])
+
+    def seed(self: DrillScheduler, results: list[Result]) -> None:
+        """
+        Reviews every pair memorized in the given results, in chronological order. The time taken for a result is
+        split evenly between its pairs.
+        """
+        updated: dict[tuple[PieceType, Target, Target], Card] = {}
+        for r in sorted(results, key=lambda r: r.start_utc):
+            pairs = [
+                (piece_type, targets[i], targets[i + 1])
+                for (piece_type, targets) in [(PieceType.EDGE, r.edge_solution), (PieceType.CORNER, r.corner_solution)]
+                for i in range(0, len(targets) - 1, 2)
+            ]
+            if not pairs or r.total_duration is None:
+                continue
+            latency = r.total_duration / len(pairs)
+            for key in pairs:
+                card = self._cards.get(key)
+                if card is not None:
+                    self._update(card, r.success, latency, r.start_utc)
+                    updated[key] = card
+        self._save(list(updated.values()))
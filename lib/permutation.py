@@ -0,0 +1,116 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+
+from lib.rubiks_cube import CenterSticker, CornerSticker, EdgeSticker, Move, RubiksCube
+from lib.utils import cycle
+
+
+@dataclass(frozen=True)
+class Permutation:
+    """
+    Sticker permutation of a Rubik's Cube. After applying the permutation, the sticker at index i is the one that was
+    previously at index centers[i] (resp. corners[i], edges[i]).
+    """
+    centers: tuple[int, ...]
+    corners: tuple[int, ...]
+    edges: tuple[int, ...]
+
+    @staticmethod
+    def identity() -> Permutation:
+        return Permutation(
+            tuple(range(len(CenterSticker))),
+            tuple(range(len(CornerSticker))),
+            tuple(range(len(EdgeSticker)))
+        )
+
+    @staticmethod
+    def from_cycles(
+        center_cycles: list[list[CenterSticker]] = [],
+        corner_cycles: list[list[CornerSticker]] = [],
+        edge_cycles: list[list[EdgeSticker]] = []
+    ) -> Permutation:
+        """
+        Permutation in which each sticker of each cycle moves to the position of the next sticker in that cycle.
+        """
+        def apply_cycles(n: int, cycles: list[list[int]]) -> tuple[int, ...]:
+            out = list(range(n))
+            for c in cycles:
+                out = cycle(out, c)
+            return tuple(out)
+        return Permutation(
+            apply_cycles(len(CenterSticker), [[s.value for s in c] for c in center_cycles]),
+            apply_cycles(len(CornerSticker), [[s.value for s in c] for c in corner_cycles]),
+            apply_cycles(len(EdgeSticker), [[s.value for s in c] for c in edge_cycles])
+        )
+
+    @staticmethod
+    def of_move(m: Move) -> Permutation:
+        return _move_permutations()[m]
+
+    @staticmethod
+    def of_moves(moves: list[Move]) -> Permutation:
+        p = Permutation.identity()
+        for m in moves:
+            p = p.then(Permutation.of_move(m))
+        return p
+
+    def then(self: Permutation, o: Permutation) -> Permutation:
+        """
+        Permutation equivalent to applying this permutation followed by the other one.
+        """
+        return Permutation(
+            tuple(self.centers[i] for i in o.centers),
+            tuple(self.corners[i] for i in o.corners),
+            tuple(self.edges[i] for i in o.edges)
+        )
+
+    def inverse(self: Permutation) -> Permutation:
+        def invert(p: tuple[int, ...]) -> tuple[int, ...]:
+            out = [0] * len(p)
+            for (i, x) in enumerate(p):
+                out[x] = i
+            return tuple(out)
+        return Permutation(invert(self.centers), invert(self.corners), invert(self.edges))
+
+    def is_identity(self: Permutation) -> bool:
+        return self == Permutation.identity()
+
+    def apply(self: Permutation, rc: RubiksCube) -> RubiksCube:
+        return RubiksCube(
+            [rc._centers[i] for i in self.centers],
+            [rc._corners[i] for i in self.corners],
+            [rc._edges[i] for i in self.edges]
+        )
+
+    def to_bytes(self: Permutation) -> bytes:
+        return bytes(self.centers + self.corners + self.edges)
+
+    @staticmethod
+    def from_bytes(b: bytes) -> Permutation:
+        n_centers = len(CenterSticker)
+        n_corners = len(CornerSticker)
+        n_edges = len(EdgeSticker)
+        if len(b) != n_centers + n_corners + n_edges:
+            raise ValueError(f"Invalid permutation length {len(b)}.")
+        return Permutation(
+            tuple(b[:n_centers]),
+            tuple(b[n_centers:n_centers + n_corners]),
+            tuple(b[n_centers + n_corners:])
+        )
+
+
+@lru_cache(maxsize=None)
+def _move_permutations() -> dict[Move, Permutation]:
+    """
+    Permutation of every move. Building these from the cycles is faster than loading them from the table cache.
+    """
+    return {m: Permutation.from_cycles(*RubiksCube._get_cycles(m)) for m in Move}
+
+
+def move_definitions() -> list[str]:
+    """
+    Description of every move and its permutation, to use as the sources of tables built from moves (see
+    TableCache.load_or_build) so that they are rebuilt when the moves change.
+    """
+    return [f"{m.name}={m.value!r}:{Permutation.of_move(m).to_bytes().hex()}" for m in Move]
@@ -0,0 +1,137 @@
+from __future__ import annotations
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import ContextManager, Iterator
+import atexit
+import cProfile
+import json
+import os
+import time
+
+
+_PROFILE_ENV_VAR = "BLD_TRAINER_PROFILE"
+_PROFILE_CALLS_ENV_VAR = "BLD_TRAINER_PROFILE_CALLS"
+_NULL_CONTEXT = nullcontext()
+
+
+@dataclass
+class _Timer:
+    count: int = 0
+    total_ns: int = 0
+    min_ns: int | None = None
+    max_ns: int = 0
+
+    def add(self: _Timer, ns: int) -> None:
+        self.count += 1
+        self.total_ns += ns
+        self.min_ns = ns if self.min_ns is None else min(self.min_ns, ns)
+        self.max_ns = max(self.max_ns, ns)
+
+    def summary(self: _Timer) -> dict[str, float | int]:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0,
+            "min_ms": (self.min_ns or 0) / 1e6,
+            "max_ms": self.max_ns / 1e6
+        }
+
+
+class Profiler:
+    """
+    Opt-in timers and counters for the phases of the training loop. When disabled, phase() and attempt() return a
+    shared no-op context manager and count() returns immediately.
+    """
+
+    def __init__(self: Profiler) -> None:
+        self.enabled = False
+        self._output: str | None = None
+        self._capture_calls = False
+        self._timers: dict[str, _Timer] = {}
+        self._counters: dict[str, int] = {}
+        self._profiles: list[str] = []
+
+    def enable(self: Profiler, output: str, capture_calls: bool = False) -> None:
+        """
+        Starts collecting timings. The summary is written as JSON to the output file at exit. If capture_calls is set,
+        each attempt is also profiled with cProfile and saved next to the output file.
+        """
+        if not self.enabled:
+            atexit.register(self.dump)
+        self.enabled = True
+        self._output = output
+        self._capture_calls = capture_calls
+
+    def phase(self: Profiler, name: str) -> ContextManager[None]:
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._time(name)
+
+    @contextmanager
+    def _time(self: Profiler, name: str) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._timers.setdefault(name, _Timer()).add(time.perf_counter_ns() - start)
+
+    def count(self: Profiler, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def attempt(self: Profiler) -> ContextManager[None]:
+        """
+        Times a whole attempt and, if enabled, profiles it with cProfile.
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._attempt()
+
+    @contextmanager
+    def _attempt(self: Profiler) -> Iterator[None]:
+        profile = cProfile.Profile() if self._capture_calls else None
+        try:
+            with self._time("attempt"):
+                if profile is None:
+                    yield
+                else:
+                    profile.enable()
+                    try:
+                        yield
+                    finally:
+                        profile.disable()
+        finally:
+            if profile is not None and self._output is not None:
+                filename = f"{os.path.splitext(self._output)[0]}.attempt{len(self._profiles) + 1}.prof"
+                if os.path.dirname(filename):
+                    os.makedirs(os.path.dirname(filename), exist_ok=True)
+                profile.dump_stats(filename)
+                self._profiles.append(filename)
+
+    def summary(self: Profiler) -> dict[str, object]:
+        return {
+            "phases": {name: t.summary() for (name, t) in self._timers.items()},
+            "counters": dict(self._counters),
+            "profiles": list(self._profiles)
+        }
+
+    def dump(self: Profiler) -> None:
+        if not self.enabled or self._output is None:
+            return
+        if os.path.dirname(self._output):
+            os.makedirs(os.path.dirname(self._output), exist_ok=True)
+        with open(self._output, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+PROFILER = Profiler()
+
+
+def enable_from_environment() -> None:
+    """
+    Enables the profiler if the BLD_TRAINER_PROFILE environment variable holds an output file name.
+    Setting BLD_TRAINER_PROFILE_CALLS to 1 also profiles each attempt with cProfile.
+    """
+    output = os.environ.get(_PROFILE_ENV_VAR)
+    if output:
+        PROFILER.enable(output, os.environ.get(_PROFILE_CALLS_ENV_VAR) == "1")
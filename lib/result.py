@@ -2,7 +2,6 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import csv
-import math
 import os
 
 from lib.rubiks_cube import Move
@@ -10,7 +9,7 @@ from lib.solver import Target
 
 
 _RESULTS_FILENAME = "results/memo.csv"
-_HEADER_ROW = [
+HEADER_ROW = [
     "start_utc",
     "scramble",
     "duration_millis",
@@ -19,6 +18,10 @@ _HEADER_ROW = [
     "success",
     "game_mode"
 ]
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# Lookup tables for parsing, which are much faster than Move.parse and Target[...]
+_MOVES = {str(m): m for m in Move}
+TARGETS = {str(t): t for t in Target}
 
 
 @dataclass
@@ -32,24 +35,55 @@ class Result:
     game_mode: str
 
 
-def _initialize_results_file() -> None:
-    os.makedirs(os.path.dirname(_RESULTS_FILENAME), exist_ok=True)
-    with open(_RESULTS_FILENAME, "w", newline="") as f:
+def _initialize_results_file(filename: str) -> None:
+    if os.path.dirname(filename):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "w", newline="") as f:
         writer = csv.writer(f)
-        writer.writerow(_HEADER_ROW)
+        writer.writerow(HEADER_ROW)
 
 
-def save_result(result: Result) -> None:
-    if not os.path.exists(_RESULTS_FILENAME):
-        _initialize_results_file()
-    with open(_RESULTS_FILENAME, "a", newline="") as f:
+def result_to_row(result: Result) -> list:
+    return [
+        result.start_utc.strftime(_TIME_FORMAT),
+        " ".join([str(m) for m in result.scramble]),
+        None if result.total_duration is None else result.total_duration // timedelta(milliseconds=1),
+        "".join([str(t) for t in result.edge_solution]),
+        "".join([str(t) for t in result.corner_solution]),
+        result.success,
+        result.game_mode
+    ]
+
+
+def row_to_result(row: list[str]) -> Result:
+    (start_utc, scramble, duration_millis, edge_solution, corner_solution, success, game_mode) = row
+    return Result(
+        datetime.fromisoformat(start_utc.removesuffix("Z")),
+        [_MOVES[m] for m in scramble.split()],
+        None if duration_millis == "" else timedelta(milliseconds=int(duration_millis)),
+        [TARGETS[t] for t in edge_solution],
+        [TARGETS[t] for t in corner_solution],
+        success == "True",
+        game_mode
+    )
+
+
+def save_results(results: list[Result], filename: str = _RESULTS_FILENAME) -> None:
+    if not os.path.exists(filename):
+        _initialize_results_file(filename)
+    with open(filename, "a", newline="") as f:
         writer = csv.writer(f)
-        writer.writerow([
-            result.start_utc.strftime("%Y-%m-%dT%H:%M:%SZ"),
-            " ".join([str(m) for m in result.scramble]),
-            None if result.total_duration is None else math.floor(result.total_duration.total_seconds() * 1000),
-            "".join([str(t) for t in result.edge_solution]),
-            "".join([str(t) for t in result.corner_solution]),
-            result.success,
-            result.game_mode
-        ])
+        writer.writerows([result_to_row(r) for r in results])
+
+
+def save_result(result: Result, filename: str = _RESULTS_FILENAME) -> None:
+    save_results([result], filename)
+
+
+def load_results(filename: str = _RESULTS_FILENAME) -> list[Result]:
+    if not os.path.exists(filename):
+        return []
+    with open(filename, "r", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return [row_to_result(row) for row in reader]
@@ -356,11 +356,11 @@ class RubiksCube:
             case CenterSticker.F.value:
                 pass
             case CenterSticker.R.value:
-                rc = self.apply([Move.Y])
+                rc = rc.apply([Move.Y])
             case CenterSticker.B.value:
-                rc = self.apply([Move.Y2])
+                rc = rc.apply([Move.Y2])
             case CenterSticker.L.value:
-                rc = self.apply([Move.Y_PRIME])
+                rc = rc.apply([Move.Y_PRIME])
             case CenterSticker.D.value:
                 raise ValueError(
                     f"Attempt to place opposite colors on top and on front ('{top_color}' and '{front_color}')."
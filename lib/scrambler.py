@@ -1,9 +1,45 @@
+from functools import lru_cache
 from typing import Callable
 import random
 
+import numpy as np
+
+from lib.big_cube import BigMove
 from lib.rubiks_cube import Layer, Move
 
 
+OUTER_TURNS = [m for m in Move if m.is_outer_turn()]
+
+
+@lru_cache(maxsize=None)
+def _scramble_transitions() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The layers that random_scramble cannot turn next form a small number of states (the first of which is the empty
+    state at the start). For each state: the indices of the allowed moves into OUTER_TURNS, how many there are, and the
+    state after each move.
+    """
+    layer: Callable[[Move], Layer] = lambda m: next(iter(m.affected_layers()))
+    states: list[frozenset[Layer]] = [frozenset()]
+    next_states: list[list[int]] = []
+    for recent in states:
+        row: list[int] = []
+        for m in OUTER_TURNS:
+            if len(recent) == 0 or layer(m) not in next(iter(recent)).parallel():
+                following = frozenset({layer(m)})
+            else:
+                following = recent | {layer(m)}
+            if following not in states:
+                states.append(following)
+            row.append(states.index(following))
+        next_states.append(row)
+    allowed = [[i for (i, m) in enumerate(OUTER_TURNS) if layer(m) not in recent] for recent in states]
+    return (
+        np.array([a + [0] * (len(OUTER_TURNS) - len(a)) for a in allowed], dtype=np.intp),
+        np.array([len(a) for a in allowed]),
+        np.array(next_states, dtype=np.intp)
+    )
+
+
 class RubiksCubeScrambler:
     @staticmethod
     def random_scramble() -> list[Move]:
@@ -23,3 +59,45 @@ class RubiksCubeScrambler:
             else:
                 recent_layers.add(layer(m))
         return scramble
+
+    @staticmethod
+    def random_scramble_batch(rng: np.random.Generator, n: int, length: int = 20) -> np.ndarray:
+        """
+        n scrambles with the same distribution as random_scramble, as an (n, length) array of indices into OUTER_TURNS.
+        """
+        (allowed, n_allowed, transitions) = _scramble_transitions()
+        state = np.zeros(n, dtype=np.intp)
+        out = np.empty((n, length), dtype=np.intp)
+        for j in range(length):
+            k = (rng.random(n) * n_allowed[state]).astype(np.intp)
+            m = allowed[state, k]
+            out[:, j] = m
+            state = transitions[state, m]
+        return out
+
+    @staticmethod
+    def random_big_scramble(n: int, length: int | None = None) -> list[BigMove]:
+        """
+        Random outer and wide turns, never turning the same face twice in a row along the same axis.
+        By default, the length is 20 * (n - 2) moves (e.g., 40 for a 4x4 and 60 for a 5x5), and at least 20.
+        """
+        if length is None:
+            length = max(20, 20 * (n - 2))
+        allowed_moves = [
+            BigMove(face, 1, depth, turns)
+            for face in [Layer.U, Layer.F, Layer.R, Layer.B, Layer.L, Layer.D]
+            for depth in range(1, n // 2 + 1)
+            for turns in [1, 2, 3]
+        ]
+        scramble: list[BigMove] = []
+        recent_faces: set[Layer] = set()
+        for _ in range(length):
+            weights = [0 if m.face in recent_faces else 1 for m in allowed_moves]
+            m = random.choices(allowed_moves, weights=weights, k=1)[0]
+            scramble.append(m)
+            # If this move is parallel to the previous one, the previous face is still recently turned
+            if len(recent_faces) == 0 or m.face not in next(iter(recent_faces)).parallel():
+                recent_faces = {m.face}
+            else:
+                recent_faces.add(m.face)
+        return scramble
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from lib.rubiks_cube import Direction, Layer, Move
+
+
+_QUARTER_TURNS = {Direction.CW: 1, Direction.DOUBLE: 2, Direction.CCW: 3}
+_LAYER_MOVES = {(m.value[0][0], _QUARTER_TURNS[m.value[0][1]]): m for m in Move if len(m.value) == 1}
+_ROTATIONS = {(m.value[0][0], _QUARTER_TURNS[m.value[0][1]]): m for m in Move if len(m.value) > 1}
+
+
+class _Group:
+    """
+    Consecutive moves along the same axis. Parallel layers commute, so their turns can be added up independently.
+    Whole-cube rotations only merge with rotations around the same axis.
+    """
+
+    def __init__(self: _Group, axis: frozenset[Layer], is_rotation: bool) -> None:
+        self.axis = axis
+        self.is_rotation = is_rotation
+        self.turns: dict[Layer, int] = {}
+
+    def accepts(self: _Group, m: Move) -> bool:
+        return (len(m.value) > 1) == self.is_rotation and m.value[0][0] in self.axis
+
+    def add(self: _Group, m: Move) -> None:
+        (layer, direction) = m.value[0]
+        turns = (self.turns.get(layer, 0) + _QUARTER_TURNS[direction]) % 4
+        if turns == 0:
+            self.turns.pop(layer, None)
+        else:
+            self.turns[layer] = turns
+
+    def moves(self: _Group) -> list[Move]:
+        table = _ROTATIONS if self.is_rotation else _LAYER_MOVES
+        return [table[(layer, turns)] for (layer, turns) in self.turns.items()]
+
+
+def simplify(moves: list[Move]) -> list[Move]:
+    """
+    Merges consecutive turns of parallel layers and drops those that cancel out, in linear time.
+    Example: "U D U R R' D" becomes "U2 D2".
+    """
+    groups: list[_Group] = []
+    for m in moves:
+        if not groups or not groups[-1].accepts(m):
+            groups.append(_Group(frozenset(m.value[0][0].parallel()), len(m.value) > 1))
+        groups[-1].add(m)
+        if not groups[-1].turns:
+            groups.pop()
+    return [m for g in groups for m in g.moves()]
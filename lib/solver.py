@@ -1,7 +1,12 @@
 from __future__ import annotations
 from enum import Enum, auto
+from functools import lru_cache
+from typing import Iterator
 
+from lib.permutation import move_definitions, Permutation
 from lib.rubiks_cube import Move, RubiksCube
+from lib.simplifier import simplify
+from lib.table_cache import TABLE_CACHE
 
 
 class Target(Enum):
@@ -107,25 +112,72 @@ class M2Solver:
     }
 
     @staticmethod
-    def apply_solution(rc: RubiksCube, edge_targets: list[Target], corner_targets: list[Target]) -> RubiksCube:
-        alg: list[Move] = []
+    def _algorithm_keys(edge_targets: list[Target], corner_targets: list[Target]) -> Iterator[str]:
+        """
+        Keys of M2Solver._algorithms executing the given targets, in order. Invalid targets are skipped with a warning.
+        """
         # Edges
         for (i, target) in enumerate(edge_targets):
             if i % 2 == 1:
                 target = target.flip()
-            a = M2Solver._EDGE_ALGORITHMS[target]
-            if a is None:
+            if M2Solver._EDGE_ALGORITHMS[target] is None:
                 print(f"WARNING: '{target}' is not a valid edge target.")
             else:
-                alg += a
+                yield f"edge:{target}"
         # Parity
         if len(edge_targets) % 2 == 1:
-            alg += M2Solver._PARITY_ALGORITHM
+            yield "parity"
         # Corners
         for target in corner_targets:
-            a = M2Solver._CORNER_ALGORITHMS[target]
-            if a is None:
+            if M2Solver._CORNER_ALGORITHMS[target] is None:
                 print(f"WARNING: '{target}' is not a valid corner target.")
             else:
-                alg += a
-        return rc.apply(alg)
+                yield f"corner:{target}"
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _algorithms() -> dict[str, list[Move]]:
+        """
+        Every algorithm, keyed by "edge:<target>", "corner:<target>" or "parity".
+        """
+        algorithms = {"parity": M2Solver._PARITY_ALGORITHM}
+        algorithms.update({f"edge:{t}": a for (t, a) in M2Solver._EDGE_ALGORITHMS.items() if a is not None})
+        algorithms.update({f"corner:{t}": a for (t, a) in M2Solver._CORNER_ALGORITHMS.items() if a is not None})
+        return algorithms
+
+    @staticmethod
+    def solution(edge_targets: list[Target], corner_targets: list[Target]) -> list[Move]:
+        """
+        Moves executing the given targets, with redundant moves between consecutive algorithms removed.
+        """
+        algorithms = M2Solver._algorithms()
+        alg: list[Move] = []
+        for k in M2Solver._algorithm_keys(edge_targets, corner_targets):
+            alg += algorithms[k]
+        return simplify(alg)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _compiled_algorithms() -> dict[str, Permutation]:
+        """
+        Permutation of each algorithm of M2Solver._algorithms. The cached tables are keyed by the algorithms and by the
+        definitions of the moves, so they are rebuilt when either one changes.
+        """
+        algorithms = M2Solver._algorithms()
+        tables = TABLE_CACHE.load_or_build(
+            "m2_algorithms",
+            [f"{k}={' '.join([str(m) for m in a])}" for (k, a) in algorithms.items()] + move_definitions(),
+            lambda: {k: Permutation.of_moves(a).to_bytes() for (k, a) in algorithms.items()}
+        )
+        return {k: Permutation.from_bytes(tables[k]) for k in algorithms}
+
+    @staticmethod
+    def apply_solution(rc: RubiksCube, edge_targets: list[Target], corner_targets: list[Target]) -> RubiksCube:
+        """
+        Same as replaying M2Solver.solution, but composes the precompiled permutation of each algorithm instead.
+        """
+        compiled = M2Solver._compiled_algorithms()
+        p = Permutation.identity()
+        for k in M2Solver._algorithm_keys(edge_targets, corner_targets):
+            p = p.then(compiled[k])
+        return p.apply(rc)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Generic, TypeVar
+
+from lib import coordinates
+from lib.coordinates import Coordinates, corner_pieces, edge_pieces, orientation_rank, permutation_rank
+from lib.permutation import Permutation
+from lib.rubiks_cube import CenterSticker, Color, CornerSticker, EdgeSticker, Move, RubiksCube
+
+
+T = TypeVar("T")
+
+
+def _mirror_permutation() -> Permutation:
+    """
+    Reflection through the plane between L and R.
+    """
+    def mirror(stickers: type) -> tuple[int, ...]:
+        swap = {"L": "R", "R": "L"}
+        return tuple(stickers["".join(swap.get(c, c) for c in s.name)].value for s in stickers)
+    return Permutation(mirror(CenterSticker), mirror(CornerSticker), mirror(EdgeSticker))
+
+
+_ROTATIONS = [
+    Permutation.of_moves(top + front)
+    for top in [[], [Move.X], [Move.Z_PRIME], [Move.X_PRIME], [Move.Z], [Move.Z2]]
+    for front in [[], [Move.Y], [Move.Y2], [Move.Y_PRIME]]
+]
+_MIRROR = _mirror_permutation()
+_SOLVED = RubiksCube()
+
+
+def _recoloring(p: Permutation) -> dict[Color, Color]:
+    """
+    Recoloring that brings the centers back to their default colors after applying the given symmetry.
+    """
+    moved = p.apply(_SOLVED)
+    return {moved._centers[i]: _SOLVED._centers[i] for i in range(len(CenterSticker))}
+
+
+# (sticker permutation, recoloring) for the 24 rotations, followed by the 24 rotations combined with the mirror
+SYMMETRIES = [(p, _recoloring(p)) for p in _ROTATIONS + [_MIRROR.then(p) for p in _ROTATIONS]]
+
+
+def conjugate(rc: RubiksCube, symmetry: int) -> RubiksCube:
+    """
+    The same state seen through the given symmetry (0-23 for rotations, 24-47 for mirrored rotations).
+    The cube must be in the default orientation.
+    """
+    (p, recoloring) = SYMMETRIES[symmetry]
+    return RubiksCube(
+        [recoloring[rc._centers[i]] for i in p.centers],
+        [recoloring[rc._corners[i]] for i in p.corners],
+        [recoloring[rc._edges[i]] for i in p.edges]
+    )
+
+
+_PieceTable = list[tuple[int, list[tuple[int, int]]]]
+
+
+def _piece_table(
+    p: tuple[int, ...],
+    recoloring: dict[Color, Color],
+    positions: list[tuple],
+    colors: list[tuple[Color, ...]],
+    lookup: dict[tuple[Color, ...], tuple[int, int]]
+) -> _PieceTable:
+    """
+    For each position, the position its piece comes from under the symmetry, and the (piece, orientation) it becomes
+    for each (piece, orientation) it had there, indexed by piece * number of orientations + orientation.
+    """
+    n_orientations = len(positions[0])
+    position_of = {frozenset(s.value for s in pos): i for (i, pos) in enumerate(positions)}
+    table: _PieceTable = []
+    for pos in positions:
+        sources = [p[s.value] for s in pos]
+        q = position_of[frozenset(sources)]
+        mapping: list[tuple[int, int]] = []
+        for piece in range(len(positions)):
+            for o in range(n_orientations):
+                c = colors[piece]
+                stickers = dict(zip([s.value for s in positions[q]], c[-o:] + c[:-o] if o else c))
+                mapping.append(lookup[tuple(recoloring[stickers[s]] for s in sources)])
+        table.append((q, mapping))
+    return table
+
+
+@lru_cache(maxsize=None)
+def _piece_tables() -> tuple[list[_PieceTable], list[_PieceTable]]:
+    """
+    Effect of each symmetry on the corner and edge pieces (see coordinates.corner_pieces and coordinates.edge_pieces).
+    """
+    corners = (coordinates.CORNER_POSITIONS, coordinates._CORNER_COLORS, coordinates._CORNER_LOOKUP)
+    edges = (coordinates.EDGE_POSITIONS, coordinates._EDGE_COLORS, coordinates._EDGE_LOOKUP)
+    return (
+        [_piece_table(p.corners, r, *corners) for (p, r) in SYMMETRIES],
+        [_piece_table(p.edges, r, *edges) for (p, r) in SYMMETRIES]
+    )
+
+
+def _conjugate_pieces(
+    pieces: tuple[list[int], list[int]],
+    table: _PieceTable,
+    n_orientations: int
+) -> tuple[list[int], list[int]]:
+    (permutation, orientation) = pieces
+    conjugated = [mapping[permutation[q] * n_orientations + orientation[q]] for (q, mapping) in table]
+    return ([piece for (piece, _) in conjugated], [o for (_, o) in conjugated])
+
+
+def canonical_pieces(
+    corners: tuple[list[int], list[int]],
+    edges: tuple[list[int], list[int]],
+    mirror: bool = True
+) -> tuple[tuple[list[int], list[int]], tuple[list[int], list[int]]]:
+    """
+    Pieces of the state with the smallest state ID among the states equivalent to this one under the 24 rotations (or
+    48 symmetries, including mirroring). The state ID orders states like their permutations and orientations compared
+    lexicographically (ignoring the last orientation and, for the edges, the last two pieces of the permutation, which
+    are determined by the rest), so no state IDs are computed.
+    """
+    n = len(SYMMETRIES) if mirror else len(_ROTATIONS)
+    (corner_tables, edge_tables) = _piece_tables()
+    # The corners come first in the order, so only the symmetries giving the smallest corners need the edges
+    conjugated_corners = [(_conjugate_pieces(corners, corner_tables[s], 3), s) for s in range(n)]
+    best_corners = min((cp, co[:-1]) for ((cp, co), _) in conjugated_corners)
+    candidates = [
+        (_conjugate_pieces(edges, edge_tables[s], 2), c)
+        for (c, s) in conjugated_corners
+        if (c[0], c[1][:-1]) == best_corners
+    ]
+    (e, c) = min(candidates, key=lambda candidate: (candidate[0][0][:-2], candidate[0][1][:-1]))
+    return (c, e)
+
+
+def canonical_state_id(rc: RubiksCube, mirror: bool = True) -> int:
+    """
+    Smallest state ID among the states equivalent to this one under the 24 rotations (or 48 symmetries, including
+    mirroring).
+    """
+    rc = rc.orient()
+    ((cp, co), (ep, eo)) = canonical_pieces(corner_pieces(rc), edge_pieces(rc), mirror)
+    return Coordinates(
+        permutation_rank(cp),
+        orientation_rank(co, 3),
+        permutation_rank(ep),
+        orientation_rank(eo, 2)
+    ).state_id()
+
+
+class SymmetryCache(Generic[T]):
+    """
+    LRU cache keyed by the canonical state ID of a cube, so that equivalent states seen from a different side (or in a
+    mirror) share an entry. Only use it for values that do not depend on the orientation of the cube, such as the
+    length of an optimal solution: grading and the difficulty statistics depend on the fixed buffer positions, so they
+    differ between equivalent states.
+    """
+    def __init__(self: SymmetryCache[T], maxsize: int = 1024, mirror: bool = True) -> None:
+        self._maxsize = maxsize
+        self._mirror = mirror
+        self._entries: OrderedDict[int, T] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self: SymmetryCache[T], rc: RubiksCube, compute: Callable[[RubiksCube], T]) -> T:
+        key = canonical_state_id(rc, self._mirror)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        value = compute(rc)
+        self._entries[key] = value
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def __len__(self: SymmetryCache[T]) -> int:
+        return len(self._entries)
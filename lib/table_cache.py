@@ -0,0 +1,127 @@
+from __future__ import annotations
+from typing import Callable
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+
+_CACHE_DIRECTORY = "cache"
+_CACHE_DIRECTORY_ENV_VAR = "BLD_TRAINER_CACHE_DIR"
+_MAGIC = b"BLDT"
+_FORMAT_VERSION = 1
+# Magic, format version, key, number of tables
+_HEADER = struct.Struct("<4sH32sI")
+# Name length, offset, length
+_ENTRY = struct.Struct("<HQQ")
+
+
+class TableCache:
+    """
+    Directory of binary files holding precomputed tables. Each file is named after a hash of the definitions the
+    tables were computed from, so changing the definitions invalidates it. Files are written atomically and read with
+    mmap, so processes loading the same file share it in the page cache.
+
+    Layout: header, then one entry per table (name length, offset and length of the data, followed by the name), then
+    the data of each table.
+    """
+
+    def __init__(self: TableCache, directory: str | None = None) -> None:
+        self._directory = directory or os.environ.get(_CACHE_DIRECTORY_ENV_VAR) or _CACHE_DIRECTORY
+        self._maps: list[mmap.mmap] = []
+
+    @staticmethod
+    def key(sources: list[str]) -> bytes:
+        h = hashlib.sha256(str(_FORMAT_VERSION).encode())
+        for s in sources:
+            h.update(len(s).to_bytes(8, "little"))
+            h.update(s.encode())
+        return h.digest()
+
+    def _filename(self: TableCache, name: str, key: bytes) -> str:
+        return os.path.join(self._directory, f"{name}-{key.hex()[:16]}.bin")
+
+    def load_or_build(
+        self: TableCache,
+        name: str,
+        sources: list[str],
+        build: Callable[[], dict[str, bytes]]
+    ) -> dict[str, bytes | memoryview]:
+        """
+        Tables stored under the given name for these sources, or the result of build() (which is then saved) if there
+        are none. If the cache directory cannot be written, the tables are built every time.
+        """
+        key = TableCache.key(sources)
+        filename = self._filename(name, key)
+        try:
+            return self._load(filename, key)
+        except (OSError, ValueError):
+            pass
+        tables = build()
+        try:
+            self._save(name, filename, key, tables)
+        except OSError:
+            pass
+        return dict(tables)
+
+    def _load(self: TableCache, filename: str, key: bytes) -> dict[str, bytes | memoryview]:
+        with open(filename, "rb") as f:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            tables = TableCache._parse(m, key)
+        except (struct.error, UnicodeDecodeError, ValueError):
+            m.close()
+            raise ValueError(f"Invalid table cache file '{filename}'.")
+        self._maps.append(m)
+        return tables
+
+    @staticmethod
+    def _parse(m: mmap.mmap, key: bytes) -> dict[str, bytes | memoryview]:
+        (magic, version, file_key, n_tables) = _HEADER.unpack_from(m, 0)
+        if magic != _MAGIC or version != _FORMAT_VERSION or file_key != key:
+            raise ValueError("Wrong header.")
+        entries: list[tuple[str, int, int]] = []
+        pos = _HEADER.size
+        for _ in range(n_tables):
+            (name_length, offset, length) = _ENTRY.unpack_from(m, pos)
+            pos += _ENTRY.size
+            name = m[pos:pos + name_length].decode()
+            pos += name_length
+            if offset + length > len(m):
+                raise ValueError("Truncated file.")
+            entries.append((name, offset, length))
+        view = memoryview(m)
+        return {name: view[offset:offset + length] for (name, offset, length) in entries}
+
+    def _save(self: TableCache, name: str, filename: str, key: bytes, tables: dict[str, bytes]) -> None:
+        names = [n.encode() for n in tables]
+        offset = _HEADER.size + sum(_ENTRY.size + len(n) for n in names)
+        header = bytearray(_HEADER.pack(_MAGIC, _FORMAT_VERSION, key, len(tables)))
+        for (n, data) in zip(names, tables.values()):
+            header += _ENTRY.pack(len(n), offset, len(data)) + n
+            offset += len(data)
+        os.makedirs(self._directory, exist_ok=True)
+        (fd, temp_filename) = tempfile.mkstemp(dir=self._directory, prefix=f".{name}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                for data in tables.values():
+                    f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_filename, filename)
+        except BaseException:
+            os.unlink(temp_filename)
+            raise
+        # Remove tables built from older definitions
+        for other in os.listdir(self._directory):
+            path = os.path.join(self._directory, other)
+            if other.startswith(f"{name}-") and other.endswith(".bin") and path != filename:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+TABLE_CACHE = TableCache()
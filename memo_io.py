@@ -0,0 +1,35 @@
+from __future__ import annotations
+import argparse
+import os
+import time
+
+from lib import bulk_io
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Merge results files into one history without duplicates, sorted by start time."
+    )
+    parser.add_argument("inputs", nargs="+", help="results files to merge")
+    parser.add_argument("-o", "--output", required=True, help="file to write the merged results to")
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["csv", "sqlite", "columnar"],
+        default=None,
+        help="output format (default: based on the extension of the output file)"
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    args = parser.parse_args()
+
+    start = time.time()
+    rows = bulk_io.read_rows(args.inputs, args.jobs)
+    read_time = time.time() - start
+    bulk_io.write_rows(rows, args.output, args.format)
+    print(
+        f"Read {len(rows)} results in {read_time:.1f} s, wrote {args.output} in {time.time() - start - read_time:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
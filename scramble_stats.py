@@ -0,0 +1,81 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import csv
+import os
+
+import numpy as np
+
+from lib import difficulty
+from lib.result import load_results
+from lib.scrambler import RubiksCubeScrambler
+
+
+def _scrambler_stats(seed: int, n: int) -> dict[str, np.ndarray]:
+    moves = RubiksCubeScrambler.random_scramble_batch(np.random.default_rng(seed), n)
+    return difficulty.batch_stats(*difficulty.apply_scrambles(moves))
+
+
+def _random_state_stats(seed: int, n: int) -> dict[str, np.ndarray]:
+    return difficulty.batch_stats(*difficulty.random_states(np.random.default_rng(seed), n))
+
+
+def _parallel(fn, seed: int, n: int, jobs: int, batch_size: int = 100_000) -> dict[str, np.ndarray]:
+    batches = [(seed + i, min(batch_size, n - i * batch_size)) for i in range((n + batch_size - 1) // batch_size)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(fn, *zip(*batches)))
+    return {name: np.concatenate([r[name] for r in results]) for name in difficulty.STATS}
+
+
+def _write_histograms(filename: str, columns: dict[str, dict[str, np.ndarray]]) -> None:
+    histograms = {name: difficulty.batch_histograms(stats) for (name, stats) in columns.items()}
+    metrics = sorted({metric for h in histograms.values() for metric in h})
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["metric", "value"] + list(columns))
+        for metric in metrics:
+            values = sorted({v for h in histograms.values() for v in h.get(metric, {})})
+            for v in values:
+                writer.writerow([metric, v] + [h.get(metric, {}).get(v, 0) for h in histograms.values()])
+
+
+def _print_results_by_difficulty(filename: str) -> None:
+    print(f"{'targets':>8} {'attempts':>9} {'success':>8} {'mean time':>10}")
+    by_targets: dict[int, list] = {}
+    for (r, stats) in difficulty.annotate(load_results(filename)):
+        by_targets.setdefault(stats.targets, []).append(r)
+    for (targets, results) in sorted(by_targets.items()):
+        success = sum(r.success for r in results) / len(results)
+        durations = [r.total_duration.total_seconds() for r in results if r.total_duration is not None]
+        mean = sum(durations) / len(durations) if durations else float("nan")
+        print(f"{targets:8d} {len(results):9d} {success:8.0%} {mean:9.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memorization difficulty statistics of scrambles.")
+    parser.add_argument("-n", "--count", type=int, default=1_000_000, help="number of scrambles to generate")
+    parser.add_argument("-o", "--output", default="results/scramble_stats.csv", help="CSV file for the histograms")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--results", metavar="FILE", help="also show success rate and time by difficulty for a results file")
+    args = parser.parse_args()
+
+    columns = {
+        "scrambler": _parallel(_scrambler_stats, args.seed, args.count, args.jobs),
+        "random_state": _parallel(_random_state_stats, args.seed, args.count, args.jobs),
+    }
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    _write_histograms(args.output, columns)
+    for (name, stats) in columns.items():
+        mean_targets = (stats["edge_targets"] + stats["corner_targets"]).mean()
+        parity = stats["parity"].mean()
+        print(f"{name}: {mean_targets:.2f} targets on average, {parity:.1%} with parity")
+    print(f"Histograms written to {args.output}")
+
+    if args.results:
+        _print_results_by_difficulty(args.results)
+
+
+if __name__ == "__main__":
+    main()
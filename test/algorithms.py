@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from lib import algorithms, permutation
+from lib.algorithms import AlgorithmLibrary, commutator, conjugate, invert
+from lib.permutation import Permutation
+from lib.rubiks_cube import CornerSticker as CO, Move, RubiksCube
+from lib.scrambler import RubiksCubeScrambler
+
+
+class TestAlgorithms(unittest.TestCase):
+    def test_permutation_matches_apply(self):
+        scramble = RubiksCubeScrambler.random_scramble() + Move.parse("M2 E' S X Y2 Z'")
+        actual = Permutation.of_moves(scramble).apply(RubiksCube())
+        expected = RubiksCube().apply(scramble)
+        self.assertEqual(expected, actual)
+
+
+    def test_invert(self):
+        alg = Move.parse("R U R' U' M2 X")
+        actual = RubiksCube().apply(alg + invert(alg))
+        self.assertEqual(RubiksCube(), actual)
+
+
+    def test_conjugate_cancels(self):
+        actual = conjugate(Move.parse("R U"), Move.parse("U' R'"))
+        expected = Move.parse("U' R'")
+        self.assertEqual(expected, actual)
+
+
+    def test_library_dedupes_equivalent_algorithms(self):
+        lib = AlgorithmLibrary()
+        lib.add(commutator(Move.parse("R U R'"), Move.parse("D")))
+        stored = lib.add(Move.parse("R U R' D R U' R' D'"))
+        self.assertEqual(1, len(lib))
+        self.assertEqual(8, len(stored))
+
+
+    def test_library_solving(self):
+        lib = AlgorithmLibrary()
+        alg = lib.add(Move.parse("R U' R' D' R U R' D"))
+        rc = RubiksCube().apply(invert(list(alg.moves)))
+        perm = Permutation.of_moves(invert(list(alg.moves)))
+        self.assertIs(alg, lib.solving(perm))
+        self.assertEqual(RubiksCube(), rc.apply(list(lib.solving(perm).moves)))
+        self.assertIsNone(lib.solving(Permutation.from_cycles(corner_cycles=[[CO.UFR, CO.UBR]])))
+
+
+    def test_library_save_load(self):
+        lib = AlgorithmLibrary()
+        lib.add(Move.parse("R U R' U'"))
+        lib.add(Move.parse("M2 U M2 U2 M2 U M2"))
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "algs.csv")
+            lib.save(filename)
+            loaded = AlgorithmLibrary.load(filename)
+        self.assertEqual(sorted(str(a) for a in lib), sorted(str(a) for a in loaded))
+        self.assertIn(Move.parse("R U R' U'"), loaded)
+
+
+    def test_library_load_after_moves_change(self):
+        alg = Move.parse("R U R' U'")
+        lib = AlgorithmLibrary()
+        lib.add(alg)
+        # Pretend that R turns the other way
+        moves = dict(permutation._move_permutations())
+        moves[Move.R] = moves[Move.R_PRIME]
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "algs.csv")
+            lib.save(filename)
+            try:
+                with mock.patch("lib.permutation._move_permutations", lambda: moves):
+                    algorithms._permutations_key.cache_clear()
+                    changed = Permutation.of_moves(alg)
+                    loaded = AlgorithmLibrary.load(filename)
+            finally:
+                algorithms._permutations_key.cache_clear()
+            reloaded = AlgorithmLibrary.load(filename)
+        self.assertNotEqual(Permutation.of_moves(alg), changed)
+        self.assertEqual("R U R' U'", str(loaded.find(changed)))
+        self.assertEqual("R U R' U'", str(reloaded.find(Permutation.of_moves(alg))))
+
+
+if __name__ == "__main__":
+    unittest.main()
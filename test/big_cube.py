@@ -0,0 +1,89 @@
+import random
+import unittest
+
+from lib.big_cube import BigCube, BigMove, FaceletType
+from lib.rubiks_cube import Color as C, Layer, Move, RubiksCube
+from lib.scrambler import RubiksCubeScrambler
+
+
+class TestBigCube(unittest.TestCase):
+    def test_3x3_matches_rubiks_cube(self):
+        for m in Move:
+            expected = BigCube.from_rubiks_cube(RubiksCube().apply([m]))
+            actual = BigCube(3).apply([BigMove.from_move(m)])
+            self.assertEqual(expected, actual, str(m))
+
+
+    def test_3x3_round_trip(self):
+        rng = random.Random(0)
+        scramble = [rng.choice(list(Move)) for _ in range(50)]
+        rc = RubiksCube().apply(scramble)
+        self.assertEqual(rc, BigCube.from_rubiks_cube(rc).to_rubiks_cube())
+
+
+    def test_parse(self):
+        actual = [str(m) for m in BigMove.parse("(3Rw 2R') Uw2 x y' M2 3L R")]
+        expected = ["3Rw", "2R'", "Uw2", "x", "y'", "M2", "3L", "R"]
+        self.assertEqual(expected, actual)
+
+
+    def test_parse_zero_depth(self):
+        for s in ["0R", "0Rw", "01R"]:
+            with self.assertRaises(ValueError):
+                BigMove.parse(s)
+
+
+    def test_wide_moves(self):
+        cube = BigCube(4)
+        self.assertEqual(cube.apply(BigMove.parse("2R")), cube.apply(BigMove.parse("Rw R'")))
+        self.assertEqual(cube.apply(BigMove.parse("x")), cube.apply(BigMove.parse("Rw 2L' L'")))
+
+
+    def test_apply_2R(self):
+        actual = BigCube(4).apply(BigMove.parse("2R"))
+        self.assertEqual([C.WHITE, C.WHITE, C.GREEN, C.WHITE], actual.face_colors(Layer.U)[0])
+        self.assertEqual([C.RED] * 4, actual.face_colors(Layer.R)[1])
+        self.assertFalse(actual.is_solved())
+
+
+    def test_order(self):
+        cube = BigCube(5)
+        sexy = BigMove.parse("R U R' U'")
+        actual = cube
+        for _ in range(6):
+            actual = actual.apply(sexy)
+        self.assertNotEqual(cube, cube.apply(sexy))
+        self.assertEqual(cube, actual)
+
+
+    def test_scramble_is_undone_by_inverse(self):
+        scramble = RubiksCubeScrambler.random_big_scramble(5)
+        inverse = [BigMove(m.face, m.first, m.last, 4 - m.turns) for m in reversed(scramble)]
+        self.assertEqual(60, len(scramble))
+        self.assertTrue(BigCube(5).apply(scramble + inverse + BigMove.parse("y z2")).is_solved())
+
+
+    def test_small_scramble_length(self):
+        for n in [2, 3]:
+            scramble = RubiksCubeScrambler.random_big_scramble(n)
+            self.assertEqual(20, len(scramble))
+            self.assertFalse(BigCube(n).apply(scramble).is_solved())
+
+
+    def test_facelet_types(self):
+        cube = BigCube(5)
+        actual = [cube.facelet_type(r, c) for (r, c) in [(0, 0), (0, 1), (0, 2), (1, 1), (1, 2), (2, 2)]]
+        expected = [
+            FaceletType.CORNER,
+            FaceletType.WING,
+            FaceletType.MIDGE,
+            FaceletType.X_CENTER,
+            FaceletType.T_CENTER,
+            FaceletType.CENTER
+        ]
+        self.assertEqual(expected, actual)
+        self.assertEqual(FaceletType.OBLIQUE, BigCube(7).facelet_type(1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from lib import bulk_io
+from lib.result import Result, load_results, row_to_result, save_results
+from lib.rubiks_cube import Move
+from lib.solver import Target
+
+
+def _result(day: int, scramble: str, success: bool = True) -> Result:
+    return Result(
+        datetime(2024, 3, day, 12, 30, 5),
+        Move.parse(scramble),
+        timedelta(milliseconds=1000 * day + 7),
+        [Target.A, Target.X],
+        [Target.C],
+        success,
+        "EC_DELAY"
+    )
+
+
+class TestBulkIO(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.first = os.path.join(self._dir.name, "first.csv")
+        self.second = os.path.join(self._dir.name, "second.csv")
+        save_results([_result(d, "R U F'") for d in [5, 1, 3, 2]], self.first)
+        save_results(
+            [_result(2, "R U F'", success=False), _result(2, "D2"), _result(4, "L")] +
+            [Result(datetime(2024, 3, 6), Move.parse("U"), None, [], [], False, "CE_NODELAY")],
+            self.second
+        )
+        self.expected = [
+            _result(1, "R U F'"),
+            _result(2, "R U F'"),
+            _result(2, "D2"),
+            _result(3, "R U F'"),
+            _result(4, "L"),
+            _result(5, "R U F'"),
+            Result(datetime(2024, 3, 6), Move.parse("U"), None, [], [], False, "CE_NODELAY"),
+        ]
+
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+
+    def test_split_covers_rows(self):
+        with open(self.first, "rb") as f:
+            f.readline()
+            rows = f.read()
+        for n in [1, 2, 3, 10]:
+            chunks = bulk_io.split(self.first, n)
+            data = b""
+            for (start, end) in chunks:
+                chunk = rows[start - chunks[0][0]:end - chunks[0][0]]
+                self.assertTrue(chunk.endswith(b"\n"))
+                data += chunk
+            self.assertEqual(rows, data)
+
+
+    def test_parse_chunks(self):
+        chunks = bulk_io.split(self.first, 3)
+        rows = [row for (start, end) in chunks for row in bulk_io.parse_chunk(self.first, start, end)]
+        self.assertCountEqual(load_results(self.first), [row_to_result(row) for row in rows])
+
+
+    def test_parse_invalid_chunk(self):
+        with open(self.first, "a") as f:
+            f.write("2024-03-07T00:00:00Z,R Q,1000,AB,C,True,EC_DELAY\n")
+        with self.assertRaises(KeyError):
+            [bulk_io.parse_chunk(self.first, start, end) for (start, end) in bulk_io.split(self.first, 2)]
+
+
+    def test_read_merges_and_dedupes(self):
+        for jobs in [1, 2]:
+            rows = bulk_io.read_rows([self.first, self.second], jobs=jobs)
+            self.assertEqual(self.expected, [row_to_result(row) for row in rows])
+
+
+    def test_write_rows(self):
+        rows = bulk_io.read_rows([self.first, self.second], jobs=1)
+        for extension in ["csv", "db", "bin"]:
+            filename = os.path.join(self._dir.name, f"rows.{extension}")
+            bulk_io.write_rows(rows, filename)
+        self.assertEqual(self.expected, load_results(os.path.join(self._dir.name, "rows.csv")))
+        self.assertEqual(self.expected, bulk_io.read_columnar(os.path.join(self._dir.name, "rows.bin")))
+
+
+    def test_csv(self):
+        filename = os.path.join(self._dir.name, "out", "merged.csv")
+        bulk_io.write(self.expected, filename)
+        self.assertEqual(self.expected, load_results(filename))
+
+
+    def test_sqlite(self):
+        filename = os.path.join(self._dir.name, "merged.db")
+        bulk_io.write(self.expected, filename)
+        with sqlite3.connect(filename) as conn:
+            rows = conn.execute("SELECT scramble, duration_millis FROM results ORDER BY start_utc").fetchall()
+        conn.close()
+        self.assertEqual(len(self.expected), len(rows))
+        self.assertEqual(("R U F'", 1007), rows[0])
+        self.assertEqual(("U", None), rows[-1])
+
+
+    def test_columnar(self):
+        filename = os.path.join(self._dir.name, "merged.bin")
+        bulk_io.write(self.expected, filename)
+        self.assertEqual(self.expected, bulk_io.read_columnar(filename))
+
+
+    def test_columnar_invalid(self):
+        with self.assertRaises(ValueError):
+            bulk_io.read_columnar(self.first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import itertools
+import random
+import unittest
+
+import numpy as np
+
+from lib import coordinates
+from lib.coordinates import Coordinates, N_STATE_IDS
+from lib.rubiks_cube import Move, RubiksCube
+
+
+class TestCoordinates(unittest.TestCase):
+    def test_permutation_rank(self):
+        perms = list(itertools.permutations(range(5)))
+        actual = [coordinates.permutation_rank(list(p)) for p in perms]
+        self.assertEqual(list(range(len(perms))), actual)
+        self.assertEqual([list(p) for p in perms], [coordinates.permutation_unrank(r, 5) for r in actual])
+        self.assertEqual(
+            [coordinates.permutation_parity(list(p)) for p in perms],
+            [coordinates.rank_parity(r, 5) for r in actual]
+        )
+
+
+    def test_solved(self):
+        self.assertEqual(Coordinates(0, 0, 0, 0), Coordinates.of(RubiksCube()))
+        self.assertEqual(RubiksCube(), coordinates.cube_from_state_id(0))
+
+
+    def test_state_id_round_trip(self):
+        rng = random.Random(0)
+        moves = list(Move)
+        for _ in range(50):
+            rc = RubiksCube().apply([rng.choice(moves) for _ in range(30)])
+            x = coordinates.state_id(rc)
+            self.assertLess(x, N_STATE_IDS)
+            self.assertEqual(rc.orient(), coordinates.cube_from_state_id(x))
+
+
+    def test_state_id_ignores_orientation(self):
+        rc = RubiksCube().apply(Move.parse("R U F' D2"))
+        self.assertEqual(coordinates.state_id(rc), coordinates.state_id(rc.apply(Move.parse("X Y'"))))
+
+
+    def test_batch(self):
+        cubes = [RubiksCube().apply([m]) for m in Move]
+        ids = coordinates.state_ids(cubes)
+        self.assertEqual([c.orient() for c in cubes], coordinates.cubes_from_state_ids(ids))
+
+
+    def test_batch_matches_scalar(self):
+        rng = random.Random(1)
+        moves = list(Move)
+        cubes = [RubiksCube().apply([rng.choice(moves) for _ in range(30)]) for _ in range(100)]
+        ids = coordinates.state_ids(cubes)
+        self.assertEqual([coordinates.state_id(rc) for rc in cubes], ids)
+        self.assertEqual([coordinates.cube_from_state_id(x) for x in ids], coordinates.cubes_from_state_ids(ids))
+        self.assertEqual([], coordinates.state_ids([]))
+        self.assertEqual([], coordinates.cubes_from_state_ids([]))
+
+
+    def test_batch_ranks(self):
+        perms = np.array(list(itertools.permutations(range(5))), dtype=np.int8)
+        ranks = coordinates.batch_permutation_rank(perms)
+        self.assertEqual(list(range(len(perms))), ranks.tolist())
+        self.assertEqual(perms.tolist(), coordinates.batch_permutation_unrank(ranks, 5).tolist())
+        self.assertEqual(
+            [coordinates.permutation_parity(list(p)) for p in perms],
+            coordinates.batch_rank_parity(ranks, 5).tolist()
+        )
+
+
+    def test_batch_invalid(self):
+        with self.assertRaises(ValueError):
+            coordinates.cubes_from_state_ids([0, N_STATE_IDS])
+        solved = RubiksCube()
+        corners = list(solved._corners)
+        corners[0] = corners[-1]
+        rc = RubiksCube(list(solved._centers), corners, list(solved._edges))
+        with self.assertRaises(ValueError):
+            coordinates.state_ids([RubiksCube(), rc])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import random
+import unittest
+from unittest import mock
+
+from lib import differential
+from lib.permutation import Permutation
+from lib.rubiks_cube import Move, RubiksCube
+from lib.solver import M2Solver
+
+
+def _ignores_slices(moves):
+    return RubiksCube().apply([m for m in moves if m not in {Move.M, Move.M_PRIME, Move.M2}])
+
+
+class TestDifferential(unittest.TestCase):
+    def test_engines_agree(self):
+        self.assertEqual({}, differential.run(0, 200, sorted(differential.ENGINES)))
+
+
+    def test_detects_mismatch(self):
+        moves = Move.parse("R U M' F2")
+        self.assertEqual(["broken"], differential.mismatches(moves, {"broken": _ignores_slices}))
+
+
+    def test_run_keeps_first_failure(self):
+        with mock.patch.dict(differential.ENGINES, {"broken": _ignores_slices}):
+            failures = differential.run(0, 200, ["broken", "permutation"])
+        self.assertEqual(["broken"], list(failures))
+        (moves, count) = failures["broken"]
+        self.assertGreater(count, 1)
+        self.assertEqual(["broken"], differential.mismatches(Move.parse(moves), {"broken": _ignores_slices}))
+
+
+    def test_piece_engines_skip_other_moves(self):
+        moves = Move.parse("R M' U X F2 E")
+        self.assertEqual([], differential.mismatches(moves, differential.ENGINES))
+
+
+    def test_detects_broken_compiled_solution(self):
+        compiled = dict(M2Solver._compiled_algorithms())
+        compiled["corner:L"] = Permutation.identity()
+        with mock.patch.object(M2Solver, "_compiled_algorithms", lambda: compiled):
+            failures = differential.run(0, 100, ["compiled_solution", "pieces"])
+        self.assertEqual(["compiled_solution"], list(failures))
+
+
+    def test_shrink(self):
+        rng = random.Random(0)
+        moves = differential.random_moves(rng, 40, 40) + [Move.M]
+        with mock.patch.dict(differential.ENGINES, {"broken": _ignores_slices}):
+            actual = differential.shrink(moves, "broken")
+        self.assertEqual(1, len(actual))
+        self.assertIn(actual[0], {Move.M, Move.M_PRIME, Move.M2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import unittest
+
+import numpy as np
+
+from lib import difficulty
+from lib.algorithms import invert
+from lib.coordinates import Coordinates, orientation_rank, permutation_rank
+from lib.difficulty import ScrambleStats
+from lib.rubiks_cube import Move, RubiksCube
+from lib.scrambler import OUTER_TURNS, RubiksCubeScrambler
+from lib.solver import M2Solver, Target
+
+
+class TestDifficulty(unittest.TestCase):
+    def test_solved(self):
+        self.assertEqual(ScrambleStats(0, 0, 0, 0, 0, 0), difficulty.cube_stats(RubiksCube()))
+
+
+    def test_piece_model_matches_stickers(self):
+        random.seed(0)
+        for _ in range(50):
+            scramble = RubiksCubeScrambler.random_scramble()
+            expected = difficulty.cube_stats(RubiksCube().apply(scramble))
+            self.assertEqual(expected, difficulty.scramble_stats(scramble))
+
+
+    def test_targets_match_solution(self):
+        # Undoing a solution (with the cube held as when solving) gives a scramble with exactly those targets
+        solution = M2Solver.solution([Target.A, Target.B, Target.C], [Target.C, Target.J, Target.V])
+        actual = difficulty.cube_stats(RubiksCube().apply([Move.Z2] + invert(solution) + [Move.Z2]))
+        self.assertEqual(3, actual.edge_targets)
+        self.assertEqual(3, actual.corner_targets)
+        self.assertTrue(actual.parity)
+
+
+    def test_flipped_edges(self):
+        # Flips the buffer (UF when scrambling) and UB
+        actual = difficulty.scramble_stats(Move.parse("M' U M' U M' U2 M U M U M U2"))
+        self.assertEqual(ScrambleStats(0, 0, 0, 0, 1, 0), actual)
+
+
+    def test_cycle_breaks(self):
+        # T permutation: swaps UL and UR as well as UFR and UBR, which are all away from the buffers
+        actual = difficulty.scramble_stats(Move.parse("R U R' U' R' F R2 U' R' U' R U R' F'"))
+        self.assertEqual(ScrambleStats(3, 3, 1, 1, 0, 0), actual)
+
+
+    def test_batch_matches_stickers(self):
+        random.seed(1)
+        # Scrambles of different lengths, including an empty one
+        scrambles = [RubiksCubeScrambler.random_scramble()[:random.randrange(21)] for _ in range(100)] + [[]]
+        expected = [difficulty.cube_stats(RubiksCube().apply(s)) for s in scrambles]
+        self.assertEqual(expected, difficulty.batch_scramble_stats(scrambles))
+
+
+    def test_scramble_batch(self):
+        moves = RubiksCubeScrambler.random_scramble_batch(np.random.default_rng(0), 1000)
+        for row in moves:
+            scramble = [OUTER_TURNS[m] for m in row]
+            layers = [next(iter(m.affected_layers())) for m in scramble]
+            for i in range(1, len(layers)):
+                self.assertNotEqual(layers[i - 1], layers[i])
+                if i >= 2:
+                    self.assertFalse(layers[i - 2] in layers[i].parallel() and layers[i - 1] in layers[i].parallel())
+        stats = difficulty.batch_stats(*difficulty.apply_scrambles(moves))
+        expected = difficulty.batch_scramble_stats([[OUTER_TURNS[m] for m in row] for row in moves])
+        self.assertEqual(difficulty.histograms(expected), difficulty.batch_histograms(stats))
+
+
+    def test_random_states_are_reachable(self):
+        ((cp, co), (ep, eo)) = difficulty.random_states(np.random.default_rng(0), 200)
+        self.assertTrue((co.sum(axis=1) % 3 == 0).all())
+        self.assertTrue((eo.sum(axis=1) % 2 == 0).all())
+        for i in range(200):
+            c = Coordinates(
+                permutation_rank(cp[i].tolist()),
+                orientation_rank(co[i].tolist(), 3),
+                permutation_rank(ep[i].tolist()),
+                orientation_rank(eo[i].tolist(), 2)
+            )
+            self.assertEqual(c, Coordinates.of(c.to_cube()))
+            self.assertEqual(c, Coordinates.from_state_id(c.state_id()))
+
+
+    def test_histograms(self):
+        stats = [ScrambleStats(1, 2, 0, 0, 0, 0), ScrambleStats(1, 4, 0, 1, 0, 0)]
+        actual = difficulty.histograms(stats)
+        self.assertEqual({1: 2}, actual["edge_targets"])
+        self.assertEqual({2: 1, 4: 1}, actual["corner_targets"])
+        self.assertEqual({1: 2}, actual["parity"])
+
+
+if __name__ == "__main__":
+    unittest.main()
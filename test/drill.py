@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+import os
+import tempfile
+import unittest
+
+from lib.drill import DrillScheduler, PieceType
+from lib.result import Result
+from lib.rubiks_cube import Move
+from lib.solver import Target
+
+
+class TestDrill(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self._dir.name, "drill.csv")
+
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+
+    def test_pairs(self):
+        scheduler = DrillScheduler(self.filename)
+        self.assertIsNotNone(scheduler.card(PieceType.EDGE, Target.A, Target.B))
+        # Buffer targets and targets on the same piece are excluded
+        self.assertIsNone(scheduler.card(PieceType.EDGE, Target.A, Target.U))
+        self.assertIsNone(scheduler.card(PieceType.EDGE, Target.A, Target.M))
+        self.assertIsNone(scheduler.card(PieceType.CORNER, Target.A, Target.B))
+        self.assertIsNone(scheduler.card(PieceType.CORNER, Target.C, Target.I))
+
+
+    def test_review_reschedules(self):
+        scheduler = DrillScheduler(self.filename)
+        now = datetime(2024, 1, 1)
+        first = scheduler.next_card(now)
+        scheduler.review(first, True, timedelta(seconds=1), now)
+        self.assertEqual(now + timedelta(days=1), first.due)
+        self.assertIsNot(first, scheduler.next_card(now))
+
+        second = scheduler.next_card(now)
+        scheduler.review(second, False, timedelta(seconds=10), now)
+        self.assertEqual(1, second.lapses)
+        self.assertLess(second.due, first.due)
+
+
+    def test_failed_card_returns_before_new_cards(self):
+        scheduler = DrillScheduler(self.filename)
+        now = datetime(2024, 1, 1)
+        card = scheduler.next_card(now)
+        scheduler.review(card, False, timedelta(seconds=10), now)
+        # New cards are shown while the failed card is waiting to be relearned
+        waiting = scheduler.next_card(now + timedelta(seconds=30))
+        self.assertIsNot(card, waiting)
+        scheduler.review(waiting, True, timedelta(seconds=1), now + timedelta(seconds=30))
+        self.assertIs(card, scheduler.next_card(now + timedelta(minutes=2)))
+        # Once resumed, due cards still come first
+        self.assertEqual(card.key(), DrillScheduler(self.filename).next_card(now + timedelta(minutes=2)).key())
+
+
+    def test_resume(self):
+        scheduler = DrillScheduler(self.filename)
+        now = datetime(2024, 1, 1)
+        card = scheduler.card(PieceType.CORNER, Target.C, Target.D)
+        for i in range(3):
+            scheduler.review(card, True, timedelta(seconds=3), now + timedelta(days=i))
+        resumed = DrillScheduler(self.filename)
+        self.assertFalse(resumed.is_new)
+        self.assertEqual(card, resumed.card(PieceType.CORNER, Target.C, Target.D))
+
+
+    def test_seed(self):
+        scheduler = DrillScheduler(self.filename)
+        self.assertTrue(scheduler.is_new)
+        result = Result(
+            datetime(2024, 1, 1),
+            Move.parse("R U"),
+            timedelta(seconds=6),
+            [Target.A, Target.B, Target.C],
+            [Target.D, Target.F],
+            True,
+            "EC_DELAY"
+        )
+        scheduler.seed([result])
+        self.assertEqual(1, scheduler.card(PieceType.EDGE, Target.A, Target.B).repetitions)
+        self.assertEqual(1, scheduler.card(PieceType.CORNER, Target.D, Target.F).repetitions)
+        self.assertEqual(0, scheduler.card(PieceType.EDGE, Target.B, Target.C).repetitions)
+        self.assertFalse(DrillScheduler(self.filename).is_new)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import json
+import os
+import tempfile
+import unittest
+
+from lib.profiling import Profiler
+
+
+class TestProfiling(unittest.TestCase):
+    def test_disabled(self):
+        profiler = Profiler()
+        with profiler.attempt():
+            with profiler.phase("draw"):
+                pass
+        profiler.count("attempts")
+        self.assertEqual({"phases": {}, "counters": {}, "profiles": []}, profiler.summary())
+
+
+    def test_enabled(self):
+        profiler = Profiler()
+        with tempfile.TemporaryDirectory() as d:
+            output = os.path.join(d, "profile.json")
+            profiler.enable(output, capture_calls=True)
+            for _ in range(2):
+                with profiler.attempt():
+                    with profiler.phase("draw"):
+                        pass
+                    profiler.count("attempts")
+            profiler.dump()
+            with open(output) as f:
+                summary = json.load(f)
+            self.assertTrue(all(os.path.exists(p) for p in summary["profiles"]))
+        self.assertEqual(2, summary["phases"]["draw"]["count"])
+        self.assertEqual(2, summary["phases"]["attempt"]["count"])
+        self.assertEqual({"attempts": 2}, summary["counters"])
+        self.assertEqual(2, len(summary["profiles"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
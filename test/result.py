@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+import os
+import tempfile
+import unittest
+
+from lib.result import Result, load_results, save_result
+from lib.rubiks_cube import Move
+from lib.solver import Target
+
+
+class TestResult(unittest.TestCase):
+    def test_save_load(self):
+        results = [
+            Result(
+                datetime(2024, 3, 1, 12, 30, 5),
+                Move.parse("R U2 F' D L2 B"),
+                timedelta(milliseconds=61234),
+                [Target.A, Target.B, Target.C],
+                [],
+                True,
+                "EC_DELAY"
+            ),
+            Result(datetime(2024, 3, 2), Move.parse("U"), None, [], [Target.X], False, "CE_NODELAY"),
+        ]
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "results", "memo.csv")
+            for r in results:
+                save_result(r, filename)
+            actual = load_results(filename)
+        self.assertEqual(results, actual)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -103,5 +103,11 @@ class TestRubiksCube(unittest.TestCase):
         self.assertEqual(expected, actual)
 
 
+    def test_orient(self):
+        rc = RubiksCube().apply(Move.parse("R U"))
+        self.assertEqual(rc, rc.apply(Move.parse("X Y")).orient())
+        self.assertEqual(rc, rc.apply(Move.parse("Z' Y2")).orient())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from lib.rubiks_cube import Move, RubiksCube
+from lib.simplifier import simplify
+from lib.solver import M2Solver, Target
+
+
+class TestSimplifier(unittest.TestCase):
+    def test_simplify_same_layer(self):
+        actual = simplify(Move.parse("U2 U R R' L2 D D"))
+        expected = Move.parse("U' L2 D2")
+        self.assertEqual(expected, actual)
+
+
+    def test_simplify_parallel_layers(self):
+        actual = simplify(Move.parse("U D U E E' D'"))
+        expected = Move.parse("U2")
+        self.assertEqual(expected, actual)
+
+
+    def test_simplify_nested_cancellations(self):
+        actual = simplify(Move.parse("(U R U') M2 (U R' U') (U R U') M2 (U R' U')"))
+        self.assertEqual([], actual)
+
+
+    def test_simplify_rotations(self):
+        actual = simplify(Move.parse("X R R' X' X Y Y' L'"))
+        expected = Move.parse("X L'")
+        self.assertEqual(expected, actual)
+
+
+    def test_solution_is_simplified(self):
+        edge_targets = [Target.F, Target.P, Target.B]
+        corner_targets = [Target.C, Target.J]
+        unsimplified = (
+            M2Solver._EDGE_ALGORITHMS[Target.F]
+            + M2Solver._EDGE_ALGORITHMS[Target.P]
+            + M2Solver._EDGE_ALGORITHMS[Target.B]
+            + M2Solver._PARITY_ALGORITHM
+            + M2Solver._CORNER_ALGORITHMS[Target.C]
+            + M2Solver._CORNER_ALGORITHMS[Target.J]
+        )
+        actual = M2Solver.solution(edge_targets, corner_targets)
+        self.assertLess(len(actual), len(unsimplified))
+        self.assertEqual(RubiksCube().apply(unsimplified), RubiksCube().apply(actual))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import unittest
+
+from lib import coordinates, symmetry
+from lib.rubiks_cube import Move, RubiksCube
+from lib.symmetry import SymmetryCache
+
+
+class TestSymmetry(unittest.TestCase):
+    def test_symmetries_are_distinct(self):
+        rc = RubiksCube().apply(Move.parse("R U2 F' L D"))
+        ids = {coordinates.state_id(symmetry.conjugate(rc, s)) for s in range(len(symmetry.SYMMETRIES))}
+        self.assertEqual(48, len(ids))
+
+
+    def test_rotation_equivalence(self):
+        a = RubiksCube().apply(Move.parse("R U R'"))
+        b = RubiksCube().apply(Move.parse("F U F'"))
+        self.assertEqual(symmetry.canonical_state_id(a, mirror=False), symmetry.canonical_state_id(b, mirror=False))
+
+
+    def test_mirror_equivalence(self):
+        a = RubiksCube().apply(Move.parse("R U R'"))
+        b = RubiksCube().apply(Move.parse("L' U' L"))
+        self.assertNotEqual(symmetry.canonical_state_id(a, mirror=False), symmetry.canonical_state_id(b, mirror=False))
+        self.assertEqual(symmetry.canonical_state_id(a), symmetry.canonical_state_id(b))
+
+
+    def test_conjugates_are_valid(self):
+        rng = random.Random(0)
+        rc = RubiksCube().apply([rng.choice(list(Move)) for _ in range(25)]).orient()
+        for s in range(len(symmetry.SYMMETRIES)):
+            conjugate = symmetry.conjugate(rc, s)
+            self.assertEqual(conjugate, coordinates.cube_from_state_id(coordinates.state_id(conjugate)))
+
+
+    def test_canonical_matches_sticker_conjugates(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            rc = RubiksCube().apply([rng.choice(list(Move)) for _ in range(25)]).orient()
+            for (mirror, n) in [(False, 24), (True, 48)]:
+                expected = min(coordinates.state_id(symmetry.conjugate(rc, s)) for s in range(n))
+                self.assertEqual(expected, symmetry.canonical_state_id(rc, mirror))
+
+
+    def test_cache(self):
+        cache: SymmetryCache[int] = SymmetryCache(maxsize=1)
+        a = RubiksCube().apply(Move.parse("R U R'"))
+        b = RubiksCube().apply(Move.parse("B U B'")).apply([Move.Y])
+        self.assertEqual(1, cache.get_or_compute(a, lambda rc: 1))
+        self.assertEqual(1, cache.get_or_compute(b, lambda rc: 2))
+        self.assertEqual(3, cache.get_or_compute(RubiksCube(), lambda rc: 3))
+        self.assertEqual(4, cache.get_or_compute(a, lambda rc: 4))
+        self.assertEqual((1, 3), (cache.hits, cache.misses))
+        self.assertEqual(1, len(cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
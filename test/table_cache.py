@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from lib import permutation
+from lib.permutation import Permutation
+from lib.rubiks_cube import Move, RubiksCube
+from lib.scrambler import RubiksCubeScrambler
+from lib.solver import M2Solver, Target
+from lib.table_cache import TableCache
+
+
+class TestTableCache(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.cache = TableCache(self._dir.name)
+        self.builds = 0
+
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+
+    def _build(self):
+        self.builds += 1
+        return {"a": bytes([1, 2, 3]), "b": b"", "c": bytes(range(200))}
+
+
+    def test_load_or_build(self):
+        expected = self._build()
+        first = self.cache.load_or_build("t", ["x"], self._build)
+        second = TableCache(self._dir.name).load_or_build("t", ["x"], self._build)
+        self.assertEqual(2, self.builds)
+        self.assertEqual(expected, {k: bytes(v) for (k, v) in first.items()})
+        self.assertEqual(expected, {k: bytes(v) for (k, v) in second.items()})
+
+
+    def test_invalidated_when_sources_change(self):
+        self.cache.load_or_build("t", ["x"], self._build)
+        self.cache.load_or_build("t", ["y"], self._build)
+        self.cache.load_or_build("t", ["y"], self._build)
+        self.assertEqual(2, self.builds)
+        self.assertEqual(1, len(os.listdir(self._dir.name)))
+
+
+    def test_corrupt_file_is_rebuilt(self):
+        self.cache.load_or_build("t", ["x"], self._build)
+        (filename,) = os.listdir(self._dir.name)
+        with open(os.path.join(self._dir.name, filename), "wb") as f:
+            f.write(b"garbage")
+        actual = TableCache(self._dir.name).load_or_build("t", ["x"], self._build)
+        self.assertEqual(bytes([1, 2, 3]), bytes(actual["a"]))
+        self.assertEqual(2, self.builds)
+
+
+    def test_compiled_solver_matches_replay(self):
+        rc = RubiksCube().apply(RubiksCubeScrambler.random_scramble())
+        edge_targets = [Target[t] for t in "ABCEFHIJKLMO"]
+        corner_targets = [Target[t] for t in "BCDEFGHIR"]
+        expected = rc.apply(M2Solver.solution(edge_targets, corner_targets))
+        # Build the tables in the temporary directory rather than the default cache directory
+        M2Solver._compiled_algorithms.cache_clear()
+        try:
+            with mock.patch("lib.solver.TABLE_CACHE", self.cache):
+                self.assertEqual(expected, M2Solver.apply_solution(rc, edge_targets, corner_targets))
+                self.assertEqual(1, len(os.listdir(self._dir.name)))
+        finally:
+            M2Solver._compiled_algorithms.cache_clear()
+
+
+    def test_compiled_solver_rebuilt_when_moves_change(self):
+        def compiled():
+            M2Solver._compiled_algorithms.cache_clear()
+            with mock.patch("lib.solver.TABLE_CACHE", TableCache(self._dir.name)):
+                return M2Solver._compiled_algorithms()
+        alg = M2Solver._algorithms()["corner:L"]
+        # Pretend that R turns the other way
+        moves = dict(permutation._move_permutations())
+        moves[Move.R] = moves[Move.R_PRIME]
+        try:
+            before = compiled()["corner:L"]
+            with mock.patch("lib.permutation._move_permutations", lambda: moves):
+                after = compiled()["corner:L"]
+                self.assertEqual(Permutation.of_moves(alg), after)
+        finally:
+            M2Solver._compiled_algorithms.cache_clear()
+        self.assertEqual(Permutation.of_moves(alg), before)
+        self.assertNotEqual(before, after)
+        self.assertEqual(1, len(os.listdir(self._dir.name)))
+
+
+if __name__ == "__main__":
+    unittest.main()
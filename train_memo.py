@@ -2,11 +2,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
+import argparse
 import math
 import time
 
 from lib.drawer import RubiksCubeDrawer
-from lib.result import Result, save_result
+from lib.profiling import PROFILER, enable_from_environment
+from lib.drill import DrillScheduler
+from lib.result import Result, load_results, save_result
 from lib.rubiks_cube import Move, RubiksCube
 from lib.scrambler import RubiksCubeScrambler
 from lib.solver import M2Solver, Target
@@ -14,8 +17,9 @@ from lib.utils import clear_screen
 
 
 class GameMode(Enum):
-    CE_NODELAY = (False, False)
-    EC_DELAY = (True, True)
+    CE_NODELAY = (False, False, False)
+    EC_DELAY = (True, True, False)
+    LP_DRILL = (False, False, True)
 
     def edges_first(self: GameMode) -> bool:
         return self.value[0]
@@ -23,6 +27,9 @@ class GameMode(Enum):
     def has_delay(self: GameMode) -> bool:
         return self.value[1]
 
+    def is_drill(self: GameMode) -> bool:
+        return self.value[2]
+
     def __str__(self: GameMode) -> str:
         return self.name
 
@@ -38,12 +45,14 @@ def _select_game_mode() -> GameMode:
     print("Choose a game mode:")
     print("[CE] Corners, then edges (type as you go)")
     print("[EC] Edges, then corners (memorize everything and then type)")
+    print("[LP] Letter pair drill (spaced repetition)")
     print()
     while True:
         user_input = input("# ")
         match user_input.upper():
             case "CE": return GameMode.CE_NODELAY
             case "EC": return GameMode.EC_DELAY
+            case "LP": return GameMode.LP_DRILL
             case _:    print("Invalid input. Please choose a game mode from the list above.")
 
 
@@ -82,7 +91,8 @@ def _input_solution(game_mode: GameMode) -> SolutionInput:
 
 
 def _save_and_display_result(result: Result) -> None:
-    save_result(result)
+    with PROFILER.phase("save"):
+        save_result(result)
     print("Memorization successful!" if result.success else "Memorization failed.")
     print(f"Time: {_human_readable_time(result.total_duration)}")
 
@@ -90,20 +100,29 @@ def _save_and_display_result(result: Result) -> None:
 def _do_solve(game_mode: GameMode) -> None:
     clear_screen()
     # Generate random scramble and print scramble sequence
-    scramble = RubiksCubeScrambler.random_scramble()
+    with PROFILER.phase("scramble"):
+        scramble = RubiksCubeScrambler.random_scramble()
+        rc = RubiksCube().apply(scramble)
     print(f"Scramble: {' '.join([str(m) for m in scramble])}")
-    rc = RubiksCube().apply(scramble)
-    print("\n" + RubiksCubeDrawer.draw(rc) + "\n")
+    with PROFILER.phase("draw"):
+        drawing = RubiksCubeDrawer.draw(rc)
+    print("\n" + drawing + "\n")
     # Input solution
     input("Press ENTER to start")
     print()
     start_utc = datetime.utcnow()
-    si = _input_solution(game_mode)
+    with PROFILER.phase("input"):
+        si = _input_solution(game_mode)
     # Check solution
-    rc = rc.apply([Move.Z2])
-    rc = M2Solver.apply_solution(rc, si.edge_targets, si.corner_targets)
-    print("\n" + RubiksCubeDrawer.draw(rc) + "\n")
-    success = rc.is_solved()
+    with PROFILER.phase("grade"):
+        rc = rc.apply([Move.Z2])
+        rc = M2Solver.apply_solution(rc, si.edge_targets, si.corner_targets)
+        success = rc.is_solved()
+    with PROFILER.phase("draw"):
+        drawing = RubiksCubeDrawer.draw(rc)
+    print("\n" + drawing + "\n")
+    PROFILER.count("attempts")
+    PROFILER.count("successes" if success else "failures")
     # Save and print stats
     result = Result(
         start_utc,
@@ -119,12 +138,54 @@ def _do_solve(game_mode: GameMode) -> None:
     time.sleep(0.1)
 
 
+def _load_drill_scheduler() -> DrillScheduler:
+    scheduler = DrillScheduler()
+    if scheduler.is_new:
+        # Start from the pairs memorized in previous attempts
+        scheduler.seed(load_results())
+    return scheduler
+
+
+def _do_drill(scheduler: DrillScheduler) -> None:
+    clear_screen()
+    card = scheduler.next_card()
+    print(f"{card.piece_type.name.capitalize()}s: {card}")
+    print()
+    start = time.time()
+    input("Press ENTER as soon as you recall the image")
+    latency = timedelta(seconds = time.time() - start)
+    while True:
+        match input("Did you recall it correctly? [y/n] ").lower():
+            case "y": success = True
+            case "n": success = False
+            case _:   continue
+        break
+    scheduler.review(card, success, latency)
+    print(f"Time: {_human_readable_time(latency)}")
+    print(f"Next review: {card.due.strftime('%Y-%m-%d %H:%M')} UTC")
+    time.sleep(0.5)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Train blindfolded memorization.")
+    parser.add_argument("--profile", metavar="FILE", help="write per-phase timings to this JSON file at exit")
+    parser.add_argument("--profile-calls", action="store_true", help="also profile each attempt with cProfile")
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable(args.profile, args.profile_calls)
+    else:
+        enable_from_environment()
+
     clear_screen()
     game_mode = _select_game_mode()
     try:
+        if game_mode.is_drill():
+            scheduler = _load_drill_scheduler()
+            while True:
+                _do_drill(scheduler)
         while True:
-            _do_solve(game_mode)
+            with PROFILER.attempt():
+                _do_solve(game_mode)
     except KeyboardInterrupt:
         print()
         print("Exiting...")